@@ -0,0 +1,215 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+import runner
+
+BASELINE_PATH = runner.SRC_PATH.parent.joinpath("benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 20.0
+# Differences below this many seconds are treated as timer noise, whatever the percentage.
+MIN_DELTA = 0.001
+
+
+def repeat_lines(data: str, factor: int) -> str:
+    lines = [line for line in data.splitlines(keepends=False) if line.strip()]
+    return "\n".join(lines * factor)
+
+
+def repeat_blocks(data: str, factor: int) -> str:
+    blocks = [block for block in data.strip().split("\n\n") if block.strip()]
+    return "\n\n".join(blocks * factor)
+
+
+def repeat_items(data: str, factor: int) -> str:
+    return ",".join([data.strip()] * factor)
+
+
+def repeat_seeds(data: str, factor: int) -> str:
+    header, rest = data.split("\n", 1)
+    label, seeds = header.split(":")
+    return f"{label}:{seeds * factor}\n{rest}"
+
+
+# How to build a synthetic input ``factor`` times the size of the real one.
+# Day 10 is a single closed loop, which cannot be tiled, so it only runs at scale 1.
+SCALERS: dict[int, Callable[[str, int], str]] = {
+    2: repeat_lines,
+    3: repeat_lines,
+    4: repeat_lines,
+    5: repeat_seeds,
+    9: repeat_lines,
+    11: repeat_lines,
+    12: repeat_lines,
+    13: repeat_blocks,
+    14: repeat_lines,
+    15: repeat_items,
+    16: repeat_lines,
+    17: repeat_lines,
+}
+
+
+def key(day: int, part: int, scale: int) -> str:
+    return f"{day:02d}.{part}.x{scale}"
+
+
+@lru_cache(maxsize=None)
+def load_data(day: int, scale: int = 1) -> str | None:
+    data = runner.data_path(day).read_text()
+    if scale == 1:
+        return data
+    if day not in SCALERS:
+        return None
+    return SCALERS[day](data, scale)
+
+
+def measure(days: list[int], parts: list[int], scales: list[int], repeat: int) -> dict[str, float]:
+    """Median wall time in seconds of each (day, part, scale) that can be built."""
+    timings = {}
+    for day in days:
+        transformer_type = runner.load_transformer(day)
+        for scale in scales:
+            data = load_data(day, scale)
+            if data is None:
+                continue
+            for part in parts:
+                _, wall_time, _, _ = runner.run_part(transformer_type, data, part, repeat)
+                timings[key(day, part, scale)] = wall_time
+    return timings
+
+
+def import_key(day: int) -> str:
+    return f"{day:02d}.import"
+
+
+def parse_import_time(report: str) -> float:
+    """Cumulative seconds of the last module in a ``python -X importtime`` report, the one imported directly."""
+    # lines read "import time: <self us> | <cumulative us> | <module>"
+    _, cumulative, _ = report.strip().splitlines()[-1].split("|")
+    return int(cumulative) / 1_000_000
+
+
+def measure_imports(days: list[int], repeat: int) -> dict[str, float]:
+    """Median time in seconds to import each day's module in a fresh interpreter."""
+    timings = {}
+    for day in days:
+        times = []
+        for _ in range(repeat):
+            completed = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import transformer_{day:02d}"],
+                cwd=runner.SRC_PATH, capture_output=True, text=True, check=True
+            )
+            times.append(parse_import_time(completed.stderr))
+        timings[import_key(day)] = statistics.median(times)
+    return timings
+
+
+def measure_almanac(queries: int, repeat: int) -> dict[str, float]:
+    """Median seconds for ``queries`` one-seed location lookups on day 5, re-parsing per query and on one ``Almanac``."""
+    import numpy as np
+    from transformer_05 import Almanac
+
+    data = load_data(5)
+    seeds = np.resize(Almanac.from_text(data).seeds, queries)
+    reparse, compiled = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(queries):
+            Almanac.from_text(data).locations(seeds[i:i + 1])
+        reparse.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        almanac = Almanac.from_text(data)
+        for i in range(queries):
+            almanac.locations(seeds[i:i + 1])
+        compiled.append(time.perf_counter() - start)
+    return {"05.almanac.reparse": statistics.median(reparse), "05.almanac.compiled": statistics.median(compiled)}
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(timings: dict[str, float], path: Path = BASELINE_PATH) -> None:
+    baseline = load_baseline(path)
+    baseline.update(timings)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+
+
+def find_regressions(
+        timings: dict[str, float],
+        baseline: dict[str, float],
+        threshold: float = DEFAULT_THRESHOLD
+) -> dict[str, tuple[float, float]]:
+    """Entries more than ``threshold`` percent slower than their baseline, as (baseline, current)."""
+    regressions = {}
+    for name, current in timings.items():
+        if (previous := baseline.get(name)) is None:
+            continue
+        if current - previous > MIN_DELTA and current > previous * (1 + threshold / 100):
+            regressions[name] = (previous, current)
+    return regressions
+
+
+def format_comparison(timings: dict[str, float], baseline: dict[str, float]) -> str:
+    width = max([len("benchmark"), *map(len, timings)])
+    lines = [f"{'benchmark':<{width}} {'baseline (s)':>12} {'current (s)':>12} {'change':>8}"]
+    for name, current in timings.items():
+        previous = baseline.get(name)
+        if previous is None:
+            lines.append(f"{name:<{width}} {'-':>12} {current:>12.4f} {'-':>8}")
+        else:
+            change = (current - previous) / previous * 100 if previous else 0.0
+            lines.append(f"{name:<{width}} {previous:>12.4f} {current:>12.4f} {change:>+7.1f}%")
+    return "\n".join(lines)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark solutions against a saved baseline.")
+    parser.add_argument("-d", "--day", dest="days", type=int, action="append",
+                        help="day to benchmark, may be repeated (default: every day found)")
+    parser.add_argument("-p", "--part", dest="parts", type=int, action="append", choices=runner.PARTS,
+                        help="part to benchmark, may be repeated (default: both)")
+    parser.add_argument("-s", "--scale", dest="scales", type=int, action="append",
+                        help="input size multiple, e.g. 1, 10 or 100, may be repeated (default: 1)")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="runs per benchmark, the median is kept")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="percentage slowdown that counts as a regression")
+    parser.add_argument("--imports", action="store_true",
+                        help="also time a cold import of each day's module in a fresh interpreter")
+    parser.add_argument("--almanac", type=int, metavar="QUERIES",
+                        help="also time this many day 5 seed queries, re-parsing each time and on one compiled almanac")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the measured timings to the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    days = args.days or list(runner.discover())
+    timings = measure(days, args.parts or list(runner.PARTS), args.scales or [1], max(1, args.repeat))
+    if args.imports:
+        timings.update(measure_imports(days, max(1, args.repeat)))
+    if args.almanac:
+        timings.update(measure_almanac(args.almanac, max(1, args.repeat)))
+    baseline = load_baseline(args.baseline)
+    print(format_comparison(timings, baseline))
+    if args.save:
+        save_baseline(timings, args.baseline)
+        return 0
+    regressions = find_regressions(timings, baseline, args.threshold)
+    for name, (previous, current) in regressions.items():
+        print(f"REGRESSION {name}: {previous:.4f}s -> {current:.4f}s", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
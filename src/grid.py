@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import numpy as np
+
+NEWLINE = ord("\n")
+
+
+def _as_rows(buffer: bytes) -> np.ndarray | None:
+    width = buffer.find(b"\n")
+    if width < 0:
+        width = len(buffer)
+    flat = np.frombuffer(buffer + b"\n", dtype=np.uint8)
+    if len(flat) % (width + 1) != 0:
+        return None
+    rows = flat.reshape(-1, width + 1)
+    if buffer.count(b"\n") + 1 != len(rows) or not (rows[:, width] == NEWLINE).all():
+        return None
+    return rows[:, :width]
+
+
+def load_grid(data: str | bytes) -> np.ndarray:
+    """Read a rectangular text grid into a ``(rows, columns)`` array of its byte values.
+
+    Each cell costs one byte rather than the four of a ``<U1`` array, so cells
+    compare against ``ord(character)``. Surrounding whitespace, Windows line
+    endings and blank or indented lines are tolerated; rows of different
+    widths raise ``ValueError``.
+    """
+    buffer = data.encode() if isinstance(data, str) else bytes(data)
+    buffer = buffer.replace(b"\r\n", b"\n").strip()
+    if (rows := _as_rows(buffer)) is not None:
+        return rows
+    lines = [line.strip() for line in buffer.splitlines() if line.strip()]
+    if (rows := _as_rows(b"\n".join(lines))) is not None:
+        return rows
+    raise ValueError("grid rows have different widths")
+
+
+def load_grid_file(path: str | Path, mmap: bool = True) -> np.ndarray:
+    """Read a grid file, memory-mapping it by default so large boards are paged in on demand.
+
+    The memory-mapped grid is a read-only view over the file, which must hold
+    rows of equal width with one kind of line ending throughout.
+    """
+    path = Path(path)
+    if not mmap:
+        return load_grid(path.read_bytes())
+    if path.stat().st_size == 0:
+        # NumPy can't map an empty file
+        return np.zeros((0, 0), dtype=np.uint8)
+    with path.open("rb") as file:
+        first_line = file.readline()
+    line_ending = len(first_line) - len(first_line.rstrip(b"\r\n"))
+    width = len(first_line) - line_ending
+    stride = width + line_ending
+    flat = np.memmap(path, dtype=np.uint8, mode="r")
+    num_rows = (len(flat) + line_ending) // stride if stride else 0
+    # every row must end where the first one does, the last one optionally without its line ending
+    if len(flat) not in (num_rows * stride, num_rows * stride - line_ending) or not all(
+            (flat[width + i::stride] == byte).all() for i, byte in enumerate(first_line[width:])
+    ):
+        raise ValueError("grid rows have different widths")
+    return np.lib.stride_tricks.as_strided(flat, shape=(num_rows, width), strides=(stride, 1), writeable=False)
+
+
+def digit_mask(cells: np.ndarray) -> np.ndarray:
+    return (cells >= ord("0")) & (cells <= ord("9"))
+
+
+def run_cells(starts: np.ndarray, lengths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """The run index and flat position of every cell covered by runs at flat ``starts`` of ``lengths``."""
+    run_of_cell = np.repeat(np.arange(len(starts)), lengths)
+    first_cell = np.cumsum(lengths) - lengths
+    return run_of_cell, starts[run_of_cell] + np.arange(len(run_of_cell)) - first_cell[run_of_cell]
+
+
+def digit_runs(flat: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Start, end (one past the last digit) and ``int64`` value of every run of digits in a flat ``uint8`` array.
+
+    Runs come from the edges of the digit mask, and values build up by
+    Horner's rule one digit position at a time, each pass only over the runs
+    still that long, so no Python object is made per number. Works on raw
+    text as well as on a flattened grid padded so that runs can't wrap
+    between rows.
+    """
+    is_digit = digit_mask(flat)
+    edges = np.flatnonzero(is_digit[1:] != is_digit[:-1]) + 1
+    if len(is_digit) and is_digit[0]:
+        edges = np.concatenate(([0], edges))
+    if len(is_digit) and is_digit[-1]:
+        edges = np.concatenate((edges, [len(is_digit)]))
+    starts, ends = edges[0::2], edges[1::2]
+    lengths = ends - starts
+    values = flat[starts].astype(np.int64) - ord("0")
+    longer = np.arange(len(starts))
+    for place in range(1, int(lengths.max(initial=0))):
+        longer = longer[lengths[longer] > place]
+        values[longer] = values[longer] * 10 + (flat[starts[longer] + place] - ord("0"))
+    return starts, ends, values
+
+
+def encode(grid: np.ndarray, symbols: str) -> np.ndarray:
+    """Map each cell to the ``int8`` index of its character in ``symbols``, or -1 if absent."""
+    table = np.full(256, -1, dtype=np.int8)
+    for i, symbol in enumerate(symbols):
+        table[ord(symbol)] = i
+    return table[grid]
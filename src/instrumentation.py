@@ -0,0 +1,73 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Iterator
+
+
+class Instrumentation:
+    """Nested phase timers and named counters collected while a transformer runs.
+
+    Phases nest, so a ``parse`` inside ``day_05`` is recorded under the stack
+    ``("day_05", "parse")``. Times are inclusive wall seconds summed over every
+    entry into the same stack.
+    """
+
+    def __init__(self):
+        self.phases: dict[tuple[str, ...], float] = defaultdict(float)
+        self.counters: dict[str, int] = defaultdict(int)
+        self._stack: list[str] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[tuple(self._stack)] += time.perf_counter() - start
+            self._stack.pop()
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def merge(self, other: "Instrumentation") -> None:
+        for stack, seconds in other.phases.items():
+            self.phases[stack] += seconds
+        for name, n in other.counters.items():
+            self.counters[name] += n
+
+    def to_json(self) -> str:
+        import json
+        return json.dumps(
+            {
+                "phases": {";".join(stack): seconds for stack, seconds in self.phases.items()},
+                "counters": dict(self.counters),
+            },
+            indent=2
+        )
+
+    def to_collapsed(self) -> str:
+        """Folded stacks of self time in microseconds, the input format of flamegraph.pl and speedscope."""
+        self_times = dict(self.phases)
+        for stack, seconds in self.phases.items():
+            if len(stack) > 1 and stack[:-1] in self_times:
+                self_times[stack[:-1]] -= seconds
+        return "\n".join(
+            f"{';'.join(stack)} {max(0, round(seconds * 1_000_000))}"
+            for stack, seconds in sorted(self_times.items())
+        )
+
+
+class NullInstrumentation:
+    """Stands in for ``Instrumentation`` when nothing is being recorded; every call is a no-op."""
+
+    _context = nullcontext()
+
+    def phase(self, name: str) -> nullcontext:
+        return self._context
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
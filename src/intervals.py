@@ -0,0 +1,167 @@
+import bisect
+import functools
+from typing import Iterable
+
+import numpy as np
+
+# the first breakpoint of every map, so every integer falls in some segment
+MIN = -(2 ** 63)
+
+
+def merge_intervals(intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sort half-open ``(start, end)`` intervals and join the ones that overlap or touch; empty ones are dropped."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class IntervalMap:
+    """A piecewise shift of the integers: ``x`` in ``[starts[i], starts[i + 1])`` maps to ``x + offsets[i]``.
+
+    ``starts`` is sorted and begins at ``MIN``, so every integer is covered;
+    stretches that no range mentions carry an offset of 0. Neighbouring
+    segments never share an offset.
+    """
+
+    def __init__(self, starts: list[int], offsets: list[int]):
+        self.starts = starts
+        self.offsets = offsets
+        # NumPy copies and the range-minimum table, built on first use by the batch queries
+        self._arrays: tuple[np.ndarray, np.ndarray] | None = None
+        self._min_table: np.ndarray | None = None
+
+    @staticmethod
+    def from_ranges(ranges: Iterable[tuple[int, int, int]]) -> "IntervalMap":
+        """Build from non-overlapping ``(source, dest, span)`` ranges, as listed in an almanac."""
+        starts, offsets = [MIN], [0]
+        end = MIN
+        for source, dest, span in sorted(ranges):
+            if span <= 0:
+                continue
+            if source < end:
+                raise ValueError(f"range starting at {source} overlaps the one before it")
+            if source > end:
+                starts.append(end)
+                offsets.append(0)
+            starts.append(source)
+            offsets.append(dest - source)
+            end = source + span
+        starts.append(end)
+        offsets.append(0)
+        return IntervalMap(*_normalise(starts, offsets))
+
+    def __call__(self, value: int) -> int:
+        return value + self.offsets[bisect.bisect_right(self.starts, value) - 1]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IntervalMap) and (self.starts, self.offsets) == (other.starts, other.offsets)
+
+    def __repr__(self) -> str:
+        return f"IntervalMap(starts={self.starts!r}, offsets={self.offsets!r})"
+
+    def then(self, other: "IntervalMap") -> "IntervalMap":
+        """The map sending ``x`` to ``other(self(x))``."""
+        starts, offsets = [], []
+        for i, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+            # the segment's image is split wherever it crosses one of other's breakpoints
+            j = bisect.bisect_right(other.starts, start + offset) - 1
+            starts.append(start)
+            offsets.append(offset + other.offsets[j])
+            end = self.starts[i + 1] if i + 1 < len(self.starts) else None
+            for j in range(j + 1, len(other.starts)):
+                if end is not None and other.starts[j] >= end + offset:
+                    break
+                starts.append(other.starts[j] - offset)
+                offsets.append(offset + other.offsets[j])
+        return IntervalMap(*_normalise(starts, offsets))
+
+    def lookup(self, values: np.ndarray) -> np.ndarray:
+        """Map a whole array of ``int64`` points at once."""
+        starts, offsets = self._as_arrays()
+        return values + offsets[np.searchsorted(starts, values, side="right") - 1]
+
+    def range_min(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """The smallest image of each non-empty half-open ``[start, end)``, in O(log n) per range.
+
+        Every segment shifts by a constant, so within a range the minimum is at
+        the range's start or at the start of a segment it wholly covers. The
+        latter come from a sparse table of segment-start images.
+        """
+        segment_starts, offsets = self._as_arrays()
+        table = self._range_min_table()
+        first = np.searchsorted(segment_starts, starts, side="right") - 1
+        last = np.searchsorted(segment_starts, ends - 1, side="right") - 1
+        result = starts + offsets[first]
+        # segments first + 1 through last begin inside the range
+        covered = last - first
+        has_covered = covered > 0
+        level = np.log2(np.maximum(covered, 1)).astype(np.int64)
+        low = np.minimum(first + 1, len(segment_starts) - 1)
+        high = np.maximum(last - (1 << level) + 1, 0)
+        inner = np.minimum(table[level, low], table[level, high])
+        return np.where(has_covered, np.minimum(result, inner), result)
+
+    def _as_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._arrays is None:
+            self._arrays = np.array(self.starts, dtype=np.int64), np.array(self.offsets, dtype=np.int64)
+        return self._arrays
+
+    def _range_min_table(self) -> np.ndarray:
+        # row k holds the minimum image over the 2**k segment starts from each index
+        if self._min_table is None:
+            starts, offsets = self._as_arrays()
+            images = starts + offsets
+            n = len(images)
+            table = [images]
+            width = 1
+            while 2 * width <= n:
+                previous = table[-1]
+                row = previous.copy()
+                row[:n - 2 * width + 1] = np.minimum(previous[:n - 2 * width + 1], previous[width:n - width + 1])
+                table.append(row)
+                width *= 2
+            self._min_table = np.stack(table)
+        return self._min_table
+
+    def map_intervals(self, intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+        """The image of half-open ``(start, end)`` intervals, split at the breakpoints they cross and merged."""
+        images = []
+        for start, end in intervals:
+            i = bisect.bisect_right(self.starts, start) - 1
+            while start < end:
+                stop = min(end, self.starts[i + 1]) if i + 1 < len(self.starts) else end
+                images.append((start + self.offsets[i], stop + self.offsets[i]))
+                start = stop
+                i += 1
+        return merge_intervals(images)
+
+
+def _normalise(starts: list[int], offsets: list[int]) -> tuple[list[int], list[int]]:
+    # drop empty segments, then join neighbours that shift by the same amount
+    kept_starts, kept_offsets = [], []
+    for i, (start, offset) in enumerate(zip(starts, offsets)):
+        if i + 1 < len(starts) and starts[i + 1] <= start:
+            continue
+        if kept_offsets and kept_offsets[-1] == offset:
+            continue
+        kept_starts.append(start)
+        kept_offsets.append(offset)
+    return kept_starts, kept_offsets
+
+
+IDENTITY = IntervalMap([MIN], [0])
+
+
+def compose(maps: Iterable[IntervalMap]) -> IntervalMap:
+    """The single map that applies ``maps`` one after another."""
+    return functools.reduce(IntervalMap.then, maps, IDENTITY)
@@ -0,0 +1,117 @@
+import itertools
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator
+
+from instrumentation import Instrumentation
+from transformer import Transformer, iter_lines
+
+DEFAULT_CHUNK_SIZE = 64
+
+_worker_transformer: Transformer | None = None
+
+
+def _init_worker(transformer: Transformer) -> None:
+    # one copy per worker process, keeping any with_xxx settings, so its memo caches are reused across that worker's chunks
+    global _worker_transformer
+    _worker_transformer = transformer
+
+
+def _counted(run: Callable[[], Any]) -> tuple[Any, dict[str, int]]:
+    # the worker's instrumentation is a throwaway copy, so each chunk hands back what it counted for the parent to merge
+    instrumentation = _worker_transformer.instrumentation
+    if not isinstance(instrumentation, Instrumentation):
+        return run(), {}
+    instrumentation.counters.clear()
+    result = run()
+    return result, dict(instrumentation.counters)
+
+
+def _run_chunk(method_name: str, lines: tuple[str, ...]) -> tuple[list[Any], dict[str, int]]:
+    method = getattr(_worker_transformer, method_name)
+    return _counted(lambda: [method(line) for line in lines])
+
+
+def _run_batch(method_name: str, lines: tuple[str, ...]) -> tuple[Any, dict[str, int]]:
+    return _counted(lambda: getattr(_worker_transformer, method_name)(lines))
+
+
+def _chunks(lines: str | Iterable[str], chunk_size: int) -> Iterator[tuple[str, ...]]:
+    remaining = iter_lines(lines)
+    while chunk := tuple(itertools.islice(remaining, chunk_size)):
+        yield chunk
+
+
+def map_lines(
+        transformer: Transformer,
+        method_name: str,
+        lines: str | Iterable[str],
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """Apply ``transformer.<method_name>`` to every line, yielding results in input order.
+
+    With more than one worker the lines are cut into chunks of ``chunk_size``
+    and solved by a pool of processes, each holding its own copy of the
+    transformer. At most two chunks per worker are in flight, so the
+    input is still consumed lazily. Counters recorded in the workers are
+    added to ``transformer.instrumentation``; their phase timings are not.
+    """
+    if workers <= 1:
+        yield from map(getattr(transformer, method_name), iter_lines(lines))
+        return
+    for results in _submit(transformer, _run_chunk, method_name, _chunks(lines, chunk_size), workers):
+        yield from results
+
+
+def map_chunks(
+        transformer: Transformer,
+        method_name: str,
+        lines: str | Iterable[str],
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """Apply ``transformer.<method_name>`` to each tuple of up to ``chunk_size`` lines, yielding results in order.
+
+    For days whose per-line work is cheap enough that a whole block of lines
+    is best handled in one vectorized call.
+    """
+    if workers <= 1:
+        yield from map(getattr(transformer, method_name), _chunks(lines, chunk_size))
+        return
+    yield from _submit(transformer, _run_batch, method_name, _chunks(lines, chunk_size), workers)
+
+
+def _submit(
+        transformer: Transformer,
+        run: Callable[[str, tuple[str, ...]], tuple[Any, dict[str, int]]],
+        method_name: str,
+        chunks: Iterator[tuple[str, ...]],
+        workers: int
+) -> Iterator[Any]:
+    # at most two chunks per worker are in flight, so the input is still consumed lazily
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(transformer,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(run, method_name, chunk))
+            if len(pending) >= 2 * workers:
+                yield _merge_counters(transformer, pending.popleft().result())
+        while pending:
+            yield _merge_counters(transformer, pending.popleft().result())
+
+
+def _merge_counters(transformer: Transformer, outcome: tuple[Any, dict[str, int]]) -> Any:
+    result, counters = outcome
+    for name, n in counters.items():
+        transformer.instrumentation.count(name, n)
+    return result
+
+
+def sum_lines(
+        transformer: Transformer,
+        method_name: str,
+        lines: str | Iterable[str],
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    return sum(map_lines(transformer, method_name, lines, workers, chunk_size))
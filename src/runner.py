@@ -0,0 +1,260 @@
+import argparse
+import importlib
+import json
+import os
+import re
+import resource
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from instrumentation import Instrumentation
+from transformer import Transformer, parse_cache
+
+SRC_PATH = Path(__file__).parent
+DATA_PATH = SRC_PATH.parent.joinpath("data")
+MODULE_PATTERN = re.compile(r"transformer_(?P<day>\d+)\.py")
+PARTS = (1, 2)
+TIMINGS_PATH = SRC_PATH.parent.joinpath("benchmarks", "last_run.json")
+
+
+class PartResult(NamedTuple):
+    day: int
+    part: int
+    answer: Any
+    wall_time: float
+    cpu_time: float
+    peak_rss: int
+    repeats: int = 1
+    instrumentation: Instrumentation | None = None
+
+
+def discover() -> dict[int, Path]:
+    """Map each day number to its ``transformer_XX.py`` module, without importing it."""
+    days = {}
+    for path in SRC_PATH.glob("transformer_*.py"):
+        if match := MODULE_PATTERN.fullmatch(path.name):
+            days[int(match.group("day"))] = path
+    return dict(sorted(days.items()))
+
+
+def load_transformer(day: int) -> type[Transformer]:
+    module = importlib.import_module(f"transformer_{day:02d}")
+    return module.TransformerImpl
+
+
+def data_path(day: int) -> Path:
+    return DATA_PATH.joinpath(f"data_{day:02d}.txt")
+
+
+def _reset_peak_rss() -> None:
+    # Linux only: writing 5 to clear_refs resets the VmHWM high-water mark so
+    # each part reports its own peak rather than the process lifetime peak.
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _peak_rss() -> int:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def run_part(transformer_type: type[Transformer], data: str | Path, part: int, repeat: int = 1,
+             workers: int = 1, instrumentation: Instrumentation | None = None) -> tuple[Any, float, float, int]:
+    """Run one part ``repeat`` times on fresh instances.
+
+    ``data`` is either the input itself or the path of an input file. Days
+    with a ``stream_N`` method read such a file line by line; others read it
+    whole. Days with ``with_workers`` get ``workers`` processes for their own
+    line-parallel engine. With ``instrumentation`` every run records into it
+    under a ``part_N`` phase. The in-memory parse cache is cleared before every run so each one
+    pays for its own parsing, unless a parse cache directory has persisted it.
+
+    Returns the answer, the median wall and CPU times in seconds and the
+    largest peak RSS in bytes seen over all repeats.
+    """
+    answer = None
+    wall_times = []
+    cpu_times = []
+    peak_rss = 0
+    for _ in range(repeat):
+        sut = transformer_type()
+        if workers > 1 and hasattr(sut, "with_workers"):
+            sut.with_workers(workers)
+        if instrumentation is not None:
+            sut.with_instrumentation(instrumentation)
+        phase = nullcontext() if instrumentation is None else instrumentation.phase(f"part_{part}")
+        parse_cache.clear()
+        _reset_peak_rss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        with phase:
+            if not isinstance(data, Path):
+                answer = getattr(sut, f"transform_{part}")(data)
+            elif hasattr(sut, f"stream_{part}"):
+                with data.open() as file:
+                    answer = getattr(sut, f"stream_{part}")(file)
+            else:
+                answer = getattr(sut, f"transform_{part}")(data.read_text())
+        cpu_times.append(time.process_time() - cpu_start)
+        wall_times.append(time.perf_counter() - wall_start)
+        peak_rss = max(peak_rss, _peak_rss())
+    return answer, statistics.median(wall_times), statistics.median(cpu_times), peak_rss
+
+
+def run_job(day: int, part: int, repeat: int = 1, stream: bool = False, workers: int = 1,
+            profile: bool = False) -> PartResult:
+    transformer_type = load_transformer(day)
+    data = data_path(day) if stream else data_path(day).read_text()
+    instrumentation = Instrumentation() if profile else None
+    with nullcontext() if instrumentation is None else instrumentation.phase(f"day_{day:02d}"):
+        answer, wall_time, cpu_time, peak_rss = run_part(
+            transformer_type, data, part, repeat, workers, instrumentation
+        )
+    return PartResult(
+        day=day,
+        part=part,
+        answer=answer,
+        wall_time=wall_time,
+        cpu_time=cpu_time,
+        peak_rss=peak_rss,
+        repeats=repeat,
+        instrumentation=instrumentation
+    )
+
+
+def run(days: list[int], parts: list[int], repeat: int = 1, stream: bool = False,
+        workers: int = 1, profile: bool = False) -> list[PartResult]:
+    return [
+        run_job(day, part, repeat, stream, workers, profile)
+        for day in days
+        for part in parts
+    ]
+
+
+def load_timings(path: Path = TIMINGS_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_timings(results: list[PartResult], path: Path = TIMINGS_PATH) -> None:
+    timings = load_timings(path)
+    timings.update({f"{result.day}.{result.part}": result.wall_time for result in results})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(sorted(timings.items())), indent=2) + "\n")
+
+
+def schedule(jobs: list[tuple[int, int]], timings: dict[str, float]) -> list[tuple[int, int]]:
+    """Order jobs longest first by their last recorded wall time; unseen jobs go first."""
+    return sorted(jobs, key=lambda job: -timings.get(f"{job[0]}.{job[1]}", float("inf")))
+
+
+def run_parallel(days: list[int], parts: list[int], repeat: int = 1, jobs: int | None = None,
+                 timings: dict[str, float] | None = None, stream: bool = False,
+                 workers: int = 1, profile: bool = False) -> list[PartResult]:
+    """Run every (day, part) in a process pool, submitting the slowest known jobs first.
+
+    Results come back in (day, part) order whatever order they finished in.
+    """
+    ordered = schedule([(day, part) for day in days for part in parts], timings or {})
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_job, day, part, repeat, stream, workers, profile) for day, part in ordered]
+        results = [future.result() for future in futures]
+    return sorted(results, key=lambda result: (result.day, result.part))
+
+
+def write_profile(results: list[PartResult], path: Path) -> None:
+    instrumentation = Instrumentation()
+    for result in results:
+        if result.instrumentation is not None:
+            instrumentation.merge(result.instrumentation)
+    path.write_text(instrumentation.to_json() if path.suffix == ".json" else instrumentation.to_collapsed())
+
+
+def format_report(results: list[PartResult], elapsed: float | None = None) -> str:
+    lines = [f"{'day':>3} {'part':>4} {'answer':>20} {'wall (s)':>10} {'cpu (s)':>10} {'peak rss (MiB)':>15}"]
+    for result in results:
+        lines.append(
+            f"{result.day:>3} {result.part:>4} {str(result.answer):>20} "
+            f"{result.wall_time:>10.4f} {result.cpu_time:>10.4f} {result.peak_rss / 2 ** 20:>15.1f}"
+        )
+    total_wall = sum(result.wall_time for result in results)
+    total_cpu = sum(result.cpu_time for result in results)
+    lines.append(f"{'':>3} {'':>4} {'total':>20} {total_wall:>10.4f} {total_cpu:>10.4f}")
+    if elapsed is not None:
+        lines.append(f"{'':>3} {'':>4} {'elapsed':>20} {elapsed:>10.4f}")
+    return "\n".join(lines)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run advent of code solutions with timings.")
+    parser.add_argument("-d", "--day", dest="days", type=int, action="append",
+                        help="day to run, may be repeated (default: every day found)")
+    parser.add_argument("-p", "--part", dest="parts", type=int, action="append", choices=PARTS,
+                        help="part to run, may be repeated (default: both)")
+    parser.add_argument("-r", "--repeat", type=int, default=1,
+                        help="run each part N times and report median timings")
+    parser.add_argument("-j", "--jobs", type=int, nargs="?", const=0, default=None,
+                        help="run parts in a process pool of N workers (default N: one per CPU)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="worker processes for days that split their lines across a pool")
+    parser.add_argument("--stream", action="store_true",
+                        help="feed days that support it their input file line by line instead of as one string")
+    parser.add_argument("--profile", type=Path,
+                        help="record parse/solve phases and counters to this file, "
+                             "as JSON for a .json suffix and as folded flame graph stacks otherwise")
+    parser.add_argument("--parse-cache", type=Path,
+                        help="persist parsed inputs in this directory so later runs skip parsing")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> list[PartResult]:
+    args = _parse_args(argv)
+    available = discover()
+    days = args.days or list(available)
+    unknown = [day for day in days if day not in available]
+    if unknown:
+        raise SystemExit(f"No transformer found for day(s): {', '.join(map(str, unknown))}")
+    if args.parse_cache:
+        # the environment variable carries the setting into process pool workers
+        os.environ["AOC_PARSE_CACHE"] = str(args.parse_cache)
+        parse_cache.directory = args.parse_cache
+    parts = args.parts or list(PARTS)
+    repeat = max(1, args.repeat)
+    profile = args.profile is not None
+    start = time.perf_counter()
+    if args.jobs is None:
+        results = run(days, parts, repeat, args.stream, args.workers, profile)
+    else:
+        results = run_parallel(
+            days, parts, repeat, args.jobs or None, load_timings(), args.stream, args.workers, profile
+        )
+    elapsed = time.perf_counter() - start
+    save_timings(results)
+    print(format_report(results, elapsed))
+    if profile:
+        write_profile(results, args.profile)
+    return results
+
+
+def main_for(module_file: str) -> None:
+    """Run the day that ``module_file`` (a ``transformer_XX.py`` path) implements."""
+    day = MODULE_PATTERN.fullmatch(Path(module_file).name).group("day")
+    main(["--day", day] + sys.argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,114 @@
+import hashlib
+import os
+import sys
 from abc import abstractmethod
-from typing import Protocol, Any
+from collections import OrderedDict
+from pathlib import Path
+from typing import Protocol, Any, Callable, Iterable, Iterator
+
+from instrumentation import Instrumentation, NullInstrumentation, NULL_INSTRUMENTATION
+
+
+class ParseCache:
+    """Parsed inputs keyed by transformer type and a hash of the raw input.
+
+    Only the ``max_entries`` most recently used inputs of each owner stay in
+    memory, so a process that parses many large inputs doesn't keep them
+    all alive; both parts of a day share one entry. When ``directory`` is
+    set they are also written to disk, NumPy arrays as ``.npy`` and anything
+    else as a pickle, so later processes skip parsing altogether. Keys also
+    hash the source of the owner's module and of the local modules it uses,
+    so editing the parsing code leaves old entries behind rather than
+    loading them, and an entry that no longer loads is parsed again.
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_entries: int = 1):
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max_entries
+        # owner -> key -> parsed, least recently used first
+        self._entries: dict[str, OrderedDict[str, Any]] = {}
+        self._versions: dict[str, str] = {}
+
+    def get(self, owner: type, data: str, parse: Callable[[str], Any]) -> Any:
+        name = f"{owner.__module__}.{owner.__qualname__}"
+        key = f"{name}-{self._version(owner.__module__)}-{hashlib.sha256(data.encode()).hexdigest()}"
+        entries = self._entries.setdefault(name, OrderedDict())
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+        parsed = self._load(key)
+        if parsed is None:
+            parsed = parse(data)
+            self._store(key, parsed)
+        entries[key] = parsed
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return parsed
+
+    def clear(self) -> None:
+        """Forget the in-memory entries; anything persisted to disk is kept."""
+        self._entries.clear()
+
+    def _version(self, module_name: str) -> str:
+        # a hash of the module's source and of the modules beside it that it imports from, e.g. intervals for day 5
+        if module_name not in self._versions:
+            module = sys.modules.get(module_name)
+            path = getattr(module, "__file__", None)
+            if path is None:
+                self._versions[module_name] = "unversioned"
+                return self._versions[module_name]
+            folder = Path(path).parent
+            names = {module_name}
+            for value in vars(module).values():
+                names.add(value.__name__ if isinstance(value, type(module)) else getattr(value, "__module__", None))
+            digest = hashlib.sha256()
+            for name in sorted(filter(None, names)):
+                source = getattr(sys.modules.get(name), "__file__", None)
+                if source is not None and Path(source).parent == folder:
+                    digest.update(Path(source).read_bytes())
+            self._versions[module_name] = digest.hexdigest()[:16]
+        return self._versions[module_name]
+
+    def _load(self, key: str) -> Any:
+        if self.directory is None:
+            return None
+        try:
+            if (path := self.directory.joinpath(f"{key}.npy")).exists():
+                import numpy as np
+                return np.load(path, allow_pickle=False)
+            if (path := self.directory.joinpath(f"{key}.pkl")).exists():
+                import pickle
+                return pickle.loads(path.read_bytes())
+        except Exception:
+            # written by code that has since changed in a way the version missed; parse again and overwrite it
+            return None
+        return None
+
+    def _store(self, key: str, parsed: Any) -> None:
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(parsed, numpy.ndarray) and parsed.dtype != object:
+            numpy.save(self.directory.joinpath(f"{key}.npy"), parsed, allow_pickle=False)
+        else:
+            import pickle
+            self.directory.joinpath(f"{key}.pkl").write_bytes(pickle.dumps(parsed))
+
+
+parse_cache = ParseCache(os.environ.get("AOC_PARSE_CACHE"))
+
+
+def iter_lines(data: str | Iterable[str]) -> Iterator[str]:
+    """Yield the stripped, non-empty lines of a whole input or of any iterable of lines, such as an open file."""
+    lines = data.splitlines(keepends=False) if isinstance(data, str) else data
+    for line in lines:
+        if line := line.strip():
+            yield line
 
 
 class Transformer(Protocol):
+    instrumentation: Instrumentation | NullInstrumentation = NULL_INSTRUMENTATION
 
     @abstractmethod
     def transform_1(self, data: str) -> Any:
@@ -11,3 +117,21 @@ class Transformer(Protocol):
     @abstractmethod
     def transform_2(self, data: str) -> Any:
         ...
+
+    def parse(self, data: str) -> Any:
+        """Build the structure both parts work from.
+
+        Days that share parsing between parts override this and call
+        ``parsed`` from their transforms. The result is cached and shared, so
+        transforms must not mutate it.
+        """
+        return data
+
+    def parsed(self, data: str) -> Any:
+        with self.instrumentation.phase("parse"):
+            return parse_cache.get(type(self), data, self.parse)
+
+    def with_instrumentation(self, instrumentation: Instrumentation) -> Any:
+        """Record phase timings and counters from this instance into ``instrumentation``."""
+        self.instrumentation = instrumentation
+        return self
@@ -1,67 +1,138 @@
-import re
-from pathlib import Path
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Iterable
 
-from transformer import Transformer
-from functional import seq
+import numpy as np
 
-class TransformerImpl(Transformer):
-    def _compute_line_1(self, line: str):
-        limits = {
-            "red": 12,
-            "green": 13,
-            "blue": 14
-        }
-
-        game_number = int(re.match(r"Game (?P<group>\d+):", line).group("group"))
-
-        game_was_possible = True
-        for match in re.finditer(r"(?P<group>\d+) (?P<color>\w+)", line):
-            color = match.group("color")
-            number = int(match.group("group"))
-            if number > limits[color]:
-                game_was_possible = False
-                break
-
-        if game_was_possible:
-            return game_number
-        else:
-            return 0
-        
-    def _compute_line_2(self, line: str):
-        limits = {
-            "red": 0,
-            "green": 0,
-            "blue": 0
-        }
-
-        for match in re.finditer(r"(?P<group>\d+) (?P<color>\w+)", line):
-            color = match.group("color")
-            number = int(match.group("group"))
-            if number > limits[color]:
-                limits[color] = number
-
-        return seq(limits.values()).product()
+import parallel
+from grid import digit_runs
+from transformer import Transformer, parse_cache
 
-    def transform_1(self, data: str) -> Any:
-        return (
-            seq(data.splitlines(keepends=False))
-            .map(self._compute_line_1)
-            .sum()
+CHUNK_SIZE = 4096
+
+
+@dataclass
+class GameTable:
+    ids: np.ndarray
+    red: np.ndarray
+    green: np.ndarray
+    blue: np.ndarray
+
+
+@dataclass
+class GameIndex:
+    """Answers "which games fit within these cube limits" for many limit triples at once.
+
+    Each colour's maxima are rank-compressed to their distinct values, and
+    ``id_sums``/``counts`` hold 3D prefix sums over those ranks, padded with
+    a zero plane so a limit below every maximum lands on index 0. A query is
+    then three binary searches and one lookup, whatever the number of games.
+    The cubes grow with the number of distinct maxima per colour, which
+    stays small for real game logs.
+    """
+    red: np.ndarray
+    green: np.ndarray
+    blue: np.ndarray
+    id_sums: np.ndarray
+    counts: np.ndarray
+
+    @staticmethod
+    def from_table(table: GameTable) -> "GameIndex":
+        axes = [np.unique(maxima, return_inverse=True) for maxima in (table.red, table.green, table.blue)]
+        shape = tuple(len(values) + 1 for values, _ in axes)
+        ranks = tuple(inverse + 1 for _, inverse in axes)
+        id_sums = np.zeros(shape, dtype=np.int64)
+        counts = np.zeros(shape, dtype=np.int64)
+        np.add.at(id_sums, ranks, table.ids)
+        np.add.at(counts, ranks, 1)
+        for axis in range(3):
+            id_sums = id_sums.cumsum(axis)
+            counts = counts.cumsum(axis)
+        return GameIndex(*(values for values, _ in axes), id_sums, counts)
+
+    def _cells(self, limits: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        limits = np.asarray(limits).reshape(-1, 3)
+        return tuple(
+            np.searchsorted(values, limits[:, i], side="right")
+            for i, values in enumerate((self.red, self.green, self.blue))
         )
 
+    def possible_id_sums(self, limits: np.ndarray) -> np.ndarray:
+        """Sum of the ids of the games possible under each ``(red, green, blue)`` row of ``limits``."""
+        return self.id_sums[self._cells(limits)]
+
+    def possible_counts(self, limits: np.ndarray) -> np.ndarray:
+        """Number of games possible under each ``(red, green, blue)`` row of ``limits``."""
+        return self.counts[self._cells(limits)]
+
+
+class TransformerImpl(Transformer):
+
+    def __init__(self):
+        self._workers = 1
+        self._limits = (12, 13, 14)
+
+    def with_workers(self, workers: int) -> "TransformerImpl":
+        self._workers = workers
+        return self
+
+    def with_limits(self, red: int, green: int, blue: int) -> "TransformerImpl":
+        self._limits = (red, green, blue)
+        return self
+
+    def index(self, data: str) -> GameIndex:
+        """The query index over ``data``, built once and kept alongside the parsed table."""
+        return parse_cache.get(GameIndex, data, lambda data: GameIndex.from_table(self.parsed(data)))
+
+    def parse(self, data: str) -> GameTable:
+        # padded so the two bytes after the last number can always be read
+        text = np.frombuffer(data.encode() + b"  ", dtype=np.uint8)
+        _, ends, values = digit_runs(text)
+        # a number's kind is the byte after it, or after the space that follows it:
+        # ":" for "Game 12:" and "r", "g" or "b" for "3 blue"
+        kinds = text[ends]
+        kinds = np.where(kinds == ord(" "), text[ends + 1], kinds)
+        is_game = kinds == ord(":")
+        # every draw belongs to the most recent game header before it
+        rows = np.cumsum(is_game) - 1
+        maxima = []
+        for color in "rgb":
+            is_color = kinds == ord(color)
+            color_max = np.zeros(is_game.sum(), dtype=np.int64)
+            np.maximum.at(color_max, rows[is_color], values[is_color])
+            maxima.append(color_max)
+        return GameTable(values[is_game], *maxima)
+
+    def _solve_1(self, table: GameTable) -> int:
+        red, green, blue = self._limits
+        possible = (table.red <= red) & (table.green <= green) & (table.blue <= blue)
+        return int(table.ids[possible].sum())
+
+    def _solve_2(self, table: GameTable) -> int:
+        return int((table.red * table.green * table.blue).sum())
+
+    def _compute_chunk_1(self, lines: tuple[str, ...]) -> int:
+        return self._solve_1(self.parse("\n".join(lines)))
+
+    def _compute_chunk_2(self, lines: tuple[str, ...]) -> int:
+        return self._solve_2(self.parse("\n".join(lines)))
+
+    def transform_1(self, data: str) -> Any:
+        table = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return self._solve_1(table)
 
     def transform_2(self, data: str) -> Any:
-        return (
-            seq(data.splitlines(keepends=False))
-            .map(self._compute_line_2)
-            .sum()
-        )
+        table = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return self._solve_2(table)
+
+    def stream_1(self, lines: str | Iterable[str]) -> int:
+        return sum(parallel.map_chunks(self, "_compute_chunk_1", lines, self._workers, CHUNK_SIZE))
+
+    def stream_2(self, lines: str | Iterable[str]) -> int:
+        return sum(parallel.map_chunks(self, "_compute_chunk_2", lines, self._workers, CHUNK_SIZE))
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_2(data))
\ No newline at end of file
+    from runner import main_for
+    main_for(__file__)
@@ -1,179 +1,187 @@
+import bisect
 from dataclasses import dataclass
-from functools import partial
+from typing import Any
 
 import numpy as np
-import re
-from pathlib import Path
-from typing import Any
 
-from transformer import Transformer
-from functional import seq
+from grid import digit_mask, digit_runs, load_grid, run_cells
+from transformer import Transformer, iter_lines, parse_cache
+
+NEIGHBOURHOOD = [(row, column) for row in (-1, 0, 1) for column in (-1, 0, 1)]
+ENGINES = ("dense", "sparse")
 
 
 @dataclass
-class Number:
-    value: int
-    indices: list[int]
-    line_number: int
+class DigitRuns:
+    """Every number in a schematic as parallel arrays, in row-major order."""
+    values: np.ndarray
+    rows: np.ndarray
+    col_starts: np.ndarray
+    # one past the last digit, like a slice
+    col_ends: np.ndarray
 
 
 @dataclass
-class Symbol:
-    index: int
-    line_number: int
+class Schematic:
+    grid: np.ndarray
+    numbers: DigitRuns
+    # 1-based index into ``numbers`` of the number covering each cell, 0 elsewhere
+    labels: np.ndarray
+    # value of each label, with a 0 at index 0 for cells outside any number
+    values: np.ndarray
+
+
+def tokenize(grid: np.ndarray) -> DigitRuns:
+    """Find the digit runs of a ``uint8`` grid."""
+    height, width = grid.shape
+    # a blank column on the right stops a run wrapping into the next row once flattened
+    padded = np.zeros((height, width + 1), dtype=grid.dtype)
+    padded[:, :width] = grid
+    starts, ends, values = digit_runs(padded.ravel())
+    rows, col_starts = np.divmod(starts, width + 1)
+    return DigitRuns(values, rows, col_starts, col_starts + (ends - starts))
 
 
-class TransformerImpl(Transformer):
-
-    def transform_1(self, data: str) -> Any:
-        numbers = []
-        lines = []
-        splitlines = data.splitlines(keepends=False)
-        empty_grid = np.zeros((len(splitlines), len(splitlines[0])), dtype=bool)
-        symbols = empty_grid.copy()
-        for line_number, line in enumerate(splitlines):
-            current_number = []
-            for i, character in enumerate(line):
-                if character.isdigit():
-                    current_number.append(character)
+@dataclass
+class SparseSchematic:
+    """Numbers and symbols indexed by row, for huge schematics that are mostly ``.``.
+
+    Memory grows with the number of tokens rather than the grid area, and
+    each adjacency check is a binary search over the neighbouring rows.
+    """
+    # row -> (column starts, column ends one past the last digit, values), sorted by column
+    numbers: dict[int, tuple[list[int], list[int], list[int]]]
+    # row -> sorted columns of every symbol
+    symbols: dict[int, list[int]]
+    gears: list[tuple[int, int]]
+
+    @staticmethod
+    def from_text(data: str) -> "SparseSchematic":
+        numbers = {}
+        symbols = {}
+        gears = []
+        for row, line in enumerate(iter_lines(data)):
+            starts, ends, columns = [], [], []
+            # only a row's worth of bytes is scanned at a time, and only its non-blank cells reach Python
+            for column in np.flatnonzero(np.frombuffer(line.encode(), dtype=np.uint8) != ord(".")).tolist():
+                if not line[column].isdigit():
+                    columns.append(column)
+                elif ends and ends[-1] == column:
+                    ends[-1] += 1
                 else:
-                    if current_number:
-                        numbers.append(
-                            Number(
-                                value=int("".join(current_number)),
-                                indices=[i - len(current_number), i - 1],
-                                line_number=line_number
-                            )
-                        )
-                        current_number = []
-                    if character != ".":
-                        symbols[line_number, i] = True
-            if current_number:
-                numbers.append(
-                    Number(
-                        value=int("".join(current_number)),
-                        indices=[len(line) - len(current_number), len(line) - 1],
-                        line_number=line_number
-                    )
-                )
-            lines.append(line)
-
-        result = (
-            seq(numbers)
-            .filter(partial(self._number_is_adjacent_to_symbol, symbols, empty_grid))
-            .map(lambda number: number.value)
-            .sum()
-        )
+                    starts.append(column)
+                    ends.append(column + 1)
+            if starts:
+                numbers[row] = (starts, ends, [int(line[start:end]) for start, end in zip(starts, ends)])
+            if columns:
+                symbols[row] = columns
+                gears.extend((row, column) for column in columns if line[column] == "*")
+        return SparseSchematic(numbers, symbols, gears)
+
+    def part_numbers(self) -> list[int]:
+        result = []
+        for row, (starts, ends, values) in self.numbers.items():
+            for start, end, value in zip(starts, ends, values):
+                if any(self._has_symbol(row + dr, start - 1, end) for dr in (-1, 0, 1)):
+                    result.append(value)
         return result
 
-    def _number_is_adjacent_to_symbol(self, symbols, empty_grid, number):
-        adjacency_matrix = empty_grid
-
-        indices = number.indices
-        line_number = number.line_number
-
-        self._set_adjacency(adjacency_matrix, line_number, indices)
-
-        result = np.any(np.logical_and(adjacency_matrix, symbols))
-        empty_grid[:, :] = False
+    def gear_ratios(self) -> list[int]:
+        result = []
+        for row, column in self.gears:
+            adjacent = [value for dr in (-1, 0, 1) for value in self._numbers_touching(row + dr, column)]
+            if len(adjacent) == 2:
+                result.append(adjacent[0] * adjacent[1])
         return result
 
-    def _set_adjacency(self, adjacency_matrix, line_number, indices):
-        line = line_number - 1
-        height = adjacency_matrix.shape[0]
-        width = adjacency_matrix.shape[1]
-        if line >= 0:
-            adjacency_matrix[line, max(0, indices[0] - 1):min(indices[-1] + 2, width - 1)] = True
-        line = line_number + 1
-        if line < height:
-            adjacency_matrix[line, max(0, indices[0] - 1):min(indices[-1] + 2, width - 1)] = True
-        index = indices[0] - 1
-        if index >= 0:
-            adjacency_matrix[line_number, index] = True
-        index = indices[-1] + 1
-        if index < width:
-            adjacency_matrix[line_number, index] = True
-
-    def transform_2(self, data: str) -> Any:
-        splitlines = data.splitlines(keepends=False)
-        height = len(splitlines)
-        width = len(splitlines[0])
-        empty_grid = np.zeros((height, width), dtype=bool)
-        gears: list[Symbol] = []
-        numbers: list[Number] = []
-        for line_number, line in enumerate(splitlines):
-            current_number = []
-            for i, character in enumerate(line):
-                if character.isdigit():
-                    current_number.append(character)
-                else:
-                    if current_number:
-                        numbers.append(
-                            Number(
-                                value=int("".join(current_number)),
-                                indices=[i - len(current_number), i - 1],
-                                line_number=line_number
-                            )
-                        )
-                        current_number = []
-                    if character == "*":
-                        gears.append(Symbol(index=i, line_number=line_number))
-            if current_number:
-                numbers.append(
-                    Number(
-                        value=int("".join(current_number)),
-                        indices=[len(line) - len(current_number), len(line) - 1],
-                        line_number=line_number
-                    )
-                )
-
-        result = (
-            seq(gears)
-            .map(partial(self._product_of_gear_numbers_if_is_missing_gear, numbers, empty_grid))
-            .sum()
-        )
+    def _has_symbol(self, row: int, first: int, last: int) -> bool:
+        columns = self.symbols.get(row)
+        if columns is None:
+            return False
+        index = bisect.bisect_left(columns, first)
+        return index < len(columns) and columns[index] <= last
+
+    def _numbers_touching(self, row: int, column: int) -> list[int]:
+        if row not in self.numbers:
+            return []
+        starts, ends, values = self.numbers[row]
+        # numbers in a row are disjoint, so only the ones starting at or before column + 1 can reach it,
+        # and walking left stops at the first that ends too early
+        index = bisect.bisect_right(starts, column + 1) - 1
+        result = []
+        while index >= 0 and ends[index] >= column:
+            result.append(values[index])
+            index -= 1
         return result
 
-    def _product_of_gear_numbers_if_is_missing_gear(self, numbers, empty_grid, gear):
-        gear_adjacency_matrix = empty_grid.copy()
 
-        index = gear.index
-        line_number = gear.line_number
-        gear_adjacency_matrix[line_number, index] = True
+class TransformerImpl(Transformer):
 
-        numbers_are_adjacent = (
-            seq(numbers)
-            .filter(partial(self._number_is_adjacent_to_gear, gear_adjacency_matrix, empty_grid))
-            .to_list()
+    def __init__(self):
+        self._engine = "dense"
+
+    def with_engine(self, engine: str) -> "TransformerImpl":
+        """Pick ``dense``, a labelled grid, or ``sparse``, a row index that scales with the number of tokens."""
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+        self._engine = engine
+        return self
+
+    def _sparse(self, data: str) -> SparseSchematic:
+        with self.instrumentation.phase("parse"):
+            return parse_cache.get(SparseSchematic, data, SparseSchematic.from_text)
+
+    def parse(self, data: str) -> Schematic:
+        grid = load_grid(data)
+        numbers = tokenize(grid)
+        run_of_cell, cells = run_cells(
+            numbers.rows * grid.shape[1] + numbers.col_starts, numbers.col_ends - numbers.col_starts
         )
-        is_missing_gear = len(numbers_are_adjacent) == 2
-        if is_missing_gear:
-            result = (
-                seq(numbers_are_adjacent)
-                .map(lambda number: number.value)
-                .product()
-            )
-        else:
-            result = 0
-        return result
+        labels = np.zeros(grid.shape, dtype=np.int64)
+        labels.ravel()[cells] = run_of_cell + 1
+        return Schematic(grid, numbers, labels, np.concatenate(([0], numbers.values)))
 
-    def _number_is_adjacent_to_gear(self, gear_adjacency_matrix, empty_grid, number):
-        number_adjacency_matrix = empty_grid
-
-        indices = number.indices
-        line_number = number.line_number
+    def transform_1(self, data: str) -> Any:
+        if self._engine == "sparse":
+            sparse = self._sparse(data)
+            with self.instrumentation.phase("solve"):
+                return sum(sparse.part_numbers())
+        schematic = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            grid = schematic.grid
+            is_symbol = (grid != ord(".")) & ~digit_mask(grid)
+            near_symbol = self._dilate(is_symbol)
+            part_labels = np.unique(schematic.labels[near_symbol])
+            return int(schematic.values[part_labels].sum())
 
-        self._set_adjacency(number_adjacency_matrix, line_number, indices)
+    def transform_2(self, data: str) -> Any:
+        if self._engine == "sparse":
+            sparse = self._sparse(data)
+            with self.instrumentation.phase("solve"):
+                return sum(sparse.gear_ratios())
+        schematic = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            rows, columns = np.nonzero(schematic.grid == ord("*"))
+            padded = np.pad(schematic.labels, 1)
+            # labels around each gear, one row per gear, sorted so repeats of a number sit together
+            around = np.sort(
+                np.stack([padded[rows + 1 + dr, columns + 1 + dc] for dr, dc in NEIGHBOURHOOD], axis=1),
+                axis=1
+            )
+            distinct = (around > 0) & np.diff(around, axis=1, prepend=0).astype(bool)
+            is_gear = np.count_nonzero(distinct, axis=1) == 2
+            ratios = np.where(distinct, schematic.values[around], 1)[is_gear].prod(axis=1)
+            return int(ratios.sum())
 
-        result = np.any(np.logical_and(number_adjacency_matrix, gear_adjacency_matrix))
-        empty_grid[:, :] = False
-        return result
+    def _dilate(self, mask: np.ndarray) -> np.ndarray:
+        padded = np.pad(mask, 1)
+        height, width = mask.shape
+        dilated = np.zeros_like(mask)
+        for dr, dc in NEIGHBOURHOOD:
+            dilated |= padded[1 + dr:1 + dr + height, 1 + dc:1 + dc + width]
+        return dilated
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    print(sut.transform_2(data))
+    from runner import main_for
+    main_for(__file__)
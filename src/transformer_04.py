@@ -1,74 +1,100 @@
-import math
-import re
-from collections import defaultdict
-from pathlib import Path
-from typing import Any
+import itertools
+from collections import deque
+from typing import Any, Iterable
 
-from functional import seq
+import numpy as np
 
+import parallel
+from grid import digit_runs
 from transformer import Transformer
 
+CHUNK_SIZE = 4096
+BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+
+def _popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a ``uint64`` array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return BYTE_POPCOUNT[words.view(np.uint8)].sum(axis=1)
+
+
+def _to_bitmasks(cards: np.ndarray, numbers: np.ndarray, num_cards: int, num_words: int) -> np.ndarray:
+    masks = np.zeros((num_cards, num_words), dtype=np.uint64)
+    np.bitwise_or.at(masks, (cards, numbers >> 6), np.left_shift(np.uint64(1), (numbers & 63).astype(np.uint64)))
+    return masks
+
 
 class TransformerImpl(Transformer):
 
-    def _compute_line_1(self, line: str) -> int:
-        num_matches = self._get_num_matches(line)
-        return int(math.pow(2, num_matches - 1))
-
-    def _get_num_matches(self, line: str) -> int:
-        separator_index = line.index("|")
-        winning_numbers = (
-            seq(re.finditer(r"(\d+)", line[line.index(":"):separator_index]))
-            .map(lambda m: int(m.group(1))
-                 )
-            .to_set()
-        )
-        your_numbers = (
-            seq(re.finditer(r"(\d+)", line[separator_index:]))
-            .map(lambda m: int(m.group(1))
-                 )
-            .to_set()
-        )
-        num_matches = len(winning_numbers.intersection(your_numbers))
-        return num_matches
+    def __init__(self):
+        self._workers = 1
+
+    def with_workers(self, workers: int) -> "TransformerImpl":
+        self._workers = workers
+        return self
+
+    def _count_matches(self, lines: Iterable[str]) -> np.ndarray:
+        text = np.frombuffer(("\n".join(lines) + "\n").encode(), dtype=np.uint8)
+        line_ends = np.flatnonzero(text == ord("\n"))
+        colons = np.flatnonzero(text == ord(":"))
+        bars = np.flatnonzero(text == ord("|"))
+        starts, _, numbers = digit_runs(text)
+        cards = np.searchsorted(line_ends, starts)
+        # the card id sits before the colon, the winning numbers before the bar and the owned ones after it
+        is_listed = starts > colons[cards]
+        is_owned = starts > bars[cards]
+        is_winning = is_listed & ~is_owned
+        # card numbers are small, so every card's numbers fit in a few 64 bit words
+        num_words = int(numbers[is_listed].max(initial=0)) // 64 + 1
+        winning_masks = _to_bitmasks(cards[is_winning], numbers[is_winning], len(line_ends), num_words)
+        owned_masks = _to_bitmasks(cards[is_owned], numbers[is_owned], len(line_ends), num_words)
+        return _popcount_rows(winning_masks & owned_masks)
+
+    def _iter_matches(self, lines: str | Iterable[str]) -> Iterable[int]:
+        chunks = parallel.map_chunks(self, "_count_matches", lines, self._workers, CHUNK_SIZE)
+        return itertools.chain.from_iterable(chunk.tolist() for chunk in chunks)
+
+    def parse(self, data: str) -> list[int]:
+        return list(self._iter_matches(data))
+
+    def _score(self, num_match_list: Iterable[int]) -> int:
+        return sum(1 << (num_matches - 1) for num_matches in num_match_list if num_matches > 0)
+
+    def _count_cards(self, num_match_list: Iterable[int]) -> int:
+        total = 0
+        won_copies = 0
+        # a difference array over the next few cards: a card's copies are added where its winnings start
+        # and taken back off where they stop, so each card costs O(1) however many matches it has and
+        # memory is bounded by the most matches on a card. Counts can grow exponentially, so they stay Python ints
+        changes = deque()
+        for num_matches in num_match_list:
+            won_copies += changes.popleft() if changes else 0
+            num_copies = 1 + won_copies
+            total += num_copies
+            if num_matches > 0:
+                changes.extend(itertools.repeat(0, num_matches + 1 - len(changes)))
+                changes[0] += num_copies
+                changes[num_matches] -= num_copies
+        return total
 
     def transform_1(self, data: str) -> Any:
-        return (
-            seq(data.splitlines(keepends=False))
-            .map(self._compute_line_1)
-            .sum()
-        )
+        num_match_list = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return self._score(num_match_list)
 
     def transform_2(self, data: str) -> Any:
-        num_match_list = (
-            seq(data.splitlines(keepends=False))
-            .map(self._get_num_matches)
-            .to_list()
-        )
-        card_match_map = {
-            i + 1: 1
-            for i in range(len(num_match_list))
-        }
-        for i, num_matches in enumerate(num_match_list):
-            card_number = i + 1
-            for j in range(card_number + 1, card_number + num_matches + 1):
-                copy_number = j
-                # print(f"card_number: {card_number} wins {card_match_map[card_number]} instances of copy_number: {copy_number}: {card_match_map[copy_number]} -> {card_match_map[copy_number] + card_match_map[card_number]}")
-                card_match_map[copy_number] += card_match_map[card_number]
-
-
-
-        result = (
-            seq(iter(card_match_map.values()))
-            .sum()
-        )
-        return result
+        num_match_list = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return self._count_cards(num_match_list)
+
+    def stream_1(self, lines: str | Iterable[str]) -> int:
+        return self._score(self._iter_matches(lines))
+
+    def stream_2(self, lines: str | Iterable[str]) -> int:
+        return self._count_cards(self._iter_matches(lines))
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    print(sut.transform_2(data))
+    from runner import main_for
+    main_for(__file__)
@@ -1,179 +1,97 @@
 import re
-import sys
-from collections import deque
-from dataclasses import dataclass, field
-from functools import partial
-from pathlib import Path
+from dataclasses import dataclass
 from typing import Any
 
-from functional import seq
+import numpy as np
 
+from intervals import IntervalMap, compose
 from transformer import Transformer
 
 
 @dataclass
-class RangeMapping:
-    source: int
-    dest: int
-    span: int
-
-
-@dataclass
-class Map:
-    source: str
-    dest: str
-    ranges: list[RangeMapping] = field(default_factory=list)
-
-
-@dataclass
-class Range:
-    start: int
-    span: int
+class Almanac:
+    """The seeds and maps of an almanac, compiled once for any number of queries.
+
+    ``stages[i]`` maps ``categories[i]`` to ``categories[i + 1]``, from seed
+    to location, each sorted by source with its gaps filled, and
+    ``stage_by_source`` finds the stage that starts at a category. The whole
+    chain is also kept composed into one map. Everything is plain data, so
+    an almanac pickles into the parse cache.
+    """
+    seeds: np.ndarray
+    categories: list[str]
+    stages: list[IntervalMap]
+    stage_by_source: dict[str, int]
+    seed_to_location: IntervalMap
+
+    @staticmethod
+    def from_text(data: str) -> "Almanac":
+        seeds = np.zeros(0, dtype=np.int64)
+        ranges: dict[str, tuple[str, list[tuple[int, int, int]]]] = {}
+        current: list[tuple[int, int, int]] = []
+        for line in data.splitlines(keepends=False):
+            if match := re.match(r"seeds:([ \d]*)", line):
+                seeds = np.concatenate((seeds, _read_seeds(match.group(1))))
+            elif match := re.match(r"([a-z]+)-to-([a-z]+) map:", line):
+                current = []
+                ranges[match.group(1)] = (match.group(2), current)
+            elif match := re.match(r"([ \d]+)", line):
+                dest, source, span = map(int, match.group(1).split())
+                current.append((source, dest, span))
+        categories = ["seed"]
+        stages = []
+        while categories[-1] != "location":
+            dest, stage_ranges = ranges[categories[-1]]
+            stages.append(IntervalMap.from_ranges(stage_ranges))
+            categories.append(dest)
+        stage_by_source = {category: i for i, category in enumerate(categories[:-1])}
+        return Almanac(seeds, categories, stages, stage_by_source, compose(stages))
+
+    def convert(self, values: np.ndarray, source: str, dest: str) -> np.ndarray:
+        """Map ``int64`` values from one category to any later one, e.g. soil to humidity."""
+        for category in (source, dest):
+            if category not in self.categories:
+                raise ValueError(f"unknown category {category!r}, expected one of {self.categories}")
+        start, stop = self.categories.index(source), self.categories.index(dest)
+        if stop < start:
+            raise ValueError(f"can't convert backwards from {source} to {dest}")
+        if (start, stop) == (0, len(self.stages)):
+            return self.seed_to_location.lookup(values)
+        return compose(self.stages[start:stop]).lookup(values)
+
+    def locations(self, seeds: np.ndarray) -> np.ndarray:
+        return self.seed_to_location.lookup(seeds)
+
+    def lowest_location(self, starts: np.ndarray, spans: np.ndarray) -> int:
+        """The lowest location of any seed in the ranges ``[start, start + span)``."""
+        ends = starts + spans
+        non_empty = ends > starts
+        return int(self.seed_to_location.range_min(starts[non_empty], ends[non_empty]).min())
+
+
+def _read_seeds(text: str) -> np.ndarray:
+    # NumPy reads the whole list in C, which matters once there are millions of seeds
+    text = text.strip()
+    return np.fromstring(text, dtype=np.int64, sep=" ") if text else np.zeros(0, dtype=np.int64)
 
 
 class TransformerImpl(Transformer):
 
+    def parse(self, data: str) -> Almanac:
+        return Almanac.from_text(data)
+
     def transform_1(self, data: str) -> Any:
-        seeds = []
-        maps = []
-        for line in data.splitlines(keepends=False):
-            if match := re.match(r"seeds:([ \d]*)", line):
-                seeds += seq(match.group(1).split()).map(int).to_list()
-            elif match := re.match(r"([a-z]+)-to-([a-z]+) map:", line):
-                maps.append(Map(source=match.group(1), dest=match.group(2)))
-            elif match := re.match(r"([ \d]+)", line):
-                numbers = seq(match.group(1).split()).map(int).to_list()
-                source = numbers[1]
-                dest = numbers[0]
-                maps[-1].ranges.append(RangeMapping(source=source, dest=dest, span=numbers[2]))
-        starting_locations = seq(seeds).map(partial(self._get_location, maps, "seed"))
-        return min(starting_locations)
-
-    def _get_location(self, maps, source, value):
-        while source != "location":
-            m = self._get_map(maps, source)
-            source = m.dest
-            r = self._get_range(m.ranges, value)
-            if r is None:
-                value = value
-            else:
-                value = value - r.source + r.dest
-        return value
-
-    def _get_map_range(self, maps, source, value):
-        m = self._get_map(maps, source)
-        r = self._get_range(m.ranges, value)
-        return m, r
-
-    def _fill_missing_ranges(self, maps):
-        max_value = 9223372036854775807
-        for m in maps:
-            value = 0
-            ranges = seq(m.ranges).sorted(key=lambda r: r.source).to_list()
-            new_ranges = []
-            for r in ranges:
-                if r.source > value:
-                    new_ranges.append(RangeMapping(source=value, dest=value, span=r.source - value))
-                new_ranges.append(r)
-                value = r.source + r.span
-            new_ranges.append(RangeMapping(source=value, dest=value, span=max_value - value))
-            m.ranges = seq(m.ranges + new_ranges).sorted(key=lambda r: r.source).to_list()
-
-    def _get_locations(self, maps, source, value, span):
-        if span < 0:
-            return set()
-        if source == "location":
-            return {value}
-
-        m = self._get_map(maps, source)
-        options = set()
-        for r in m.ranges:
-            if r.source <= value:
-                if value < r.source + r.span:
-                    # in current range
-                    new_value = value - r.source + r.dest
-                    new_span = span
-                    options |= (self._get_locations(maps, m.dest, new_value, new_span))
-            elif value + span >= r.source:
-                # in next range
-                new_span = span - (r.source - value)
-                new_value = r.dest
-                options |= (self._get_locations(maps, m.dest, new_value, new_span))
-        return options
+        almanac = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return int(almanac.locations(almanac.seeds).min())
 
     def transform_2(self, data: str) -> Any:
-        seeds = []
-        maps = []
-        for line in data.splitlines(keepends=False):
-            if match := re.match(r"seeds:([ \d]*)", line):
-                seeds += seq(match.group(1).split()).map(int).to_list()
-            elif match := re.match(r"([a-z]+)-to-([a-z]+) map:", line):
-                maps.append(Map(source=match.group(1), dest=match.group(2)))
-            elif match := re.match(r"([ \d]+)", line):
-                numbers = seq(match.group(1).split()).map(int).to_list()
-                source = numbers[1]
-                dest = numbers[0]
-                maps[-1].ranges.append(RangeMapping(source=source, dest=dest, span=numbers[2]))
-        self._fill_missing_ranges(maps)
-        return self._solve_2(seeds, maps)
-
-    def _solve_2(self, seeds: list[int], maps: list[Map]) -> int:
-        next_queue = deque(
-            (seeds[i], seeds[i], seeds[i + 1],)
-            for i in range(0, len(seeds), 2)
-        )
-        current_type = "seed"
-        while current_type != "location":
-            target_map = self._get_map(maps, current_type)
-            current_type = target_map.dest
-            this_queue = next_queue
-            next_queue = deque()
-
-            while len(this_queue):
-                this_range = this_queue.popleft()
-                seed_start, this_start, span = this_range
-                this_end = this_start + span
-                target_range = self._get_range(target_map.ranges, this_start)
-                target_end = target_range.source + target_range.span
-                if target_range.source <= this_start < target_end:
-                    start_diff = this_start - target_range.source
-                    end_diff = target_end - this_end
-                    if end_diff >= 0:
-                        next_queue.append(
-                            (seed_start, target_range.dest + start_diff, span)
-                        )
-                    else:
-                        next_span = span + end_diff
-                        next_queue.append(
-                            (seed_start, target_range.dest + start_diff, next_span)
-                        )
-                        this_queue.append(
-                            (seed_start + next_span, this_start + next_span, -end_diff)
-                        )
-
-        result = min(next_queue, key=lambda i: i[1])[1]
-        return result
-
-    def _get_map(self, maps, source):
-        for m in maps:
-            if m.source == source:
-                return m
-
-    def _get_range(self, ranges, value):
-        for r in ranges:
-            start = r.source
-            stop = r.source + r.span
-            if start <= value < stop:
-                return r
-        return None
+        almanac = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            self.instrumentation.count("breakpoints", len(almanac.seed_to_location))
+            return almanac.lowest_location(almanac.seeds[0::2], almanac.seeds[1::2])
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    answer_2 = sut.transform_2(data)
-    assert answer_2 < 216635734
-    print(answer_2)
+    from runner import main_for
+    main_for(__file__)
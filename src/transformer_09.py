@@ -1,70 +1,152 @@
-from pathlib import Path
-from typing import Any
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable
 
 import numpy as np
-from functional import seq
 
-from transformer import Transformer
+from transformer import Transformer, iter_lines
 
+INT64_MAX = int(np.iinfo(np.int64).max)
+# a token of 19 characters can exceed int64, so inputs holding one are read as Python ints
+INT64_SAFE_DIGITS = 18
 
-class TransformerImpl(Transformer):
 
-    def _predict_next(self, x: np.ndarray) -> int:
-        result = (
-            seq(range(len(x)))
-            .map(lambda n: np.diff(x, n)[-1])
-            .sum()
-        )
-        return result
+@lru_cache(maxsize=None)
+def extrapolation_weights(length: int, steps: int = 1) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Weights that give the values ``steps`` after and before a sequence of ``length`` as dot products with it.
 
-    def _predict_next_backwards(self, x: np.ndarray) -> int:
-        x = x[::-1]
-        result = (
-            seq(range(len(x)))
-            .map(lambda n: np.diff(x, n)[-1])
-            .sum()
-        )
-        return result
+    Extending the difference table to one more value is linear in the
+    sequence: the next value is ``sum((-1) ** (length - 1 - k) * comb(length, k) * x[k])``.
+    Further steps repeat that on a sliding window, so the weights for any
+    ``steps`` are where each unit sequence ends up. Going backwards is the
+    same on the reversed sequence.
+    """
+    if steps < 1:
+        raise ValueError("steps must be at least 1")
+    one_step = [(-1) ** (length - 1 - k) * math.comb(length, k) for k in range(length)]
+    forward = []
+    for j in range(length):
+        window = [int(i == j) for i in range(length)]
+        for _ in range(steps):
+            window = window[1:] + [sum(weight * value for weight, value in zip(one_step, window))]
+        forward.append(window[-1] if window else 0)
+    return tuple(forward), tuple(reversed(forward))
 
-    def transform_1(self, data: str) -> Any:
-        sequences = self._read_sequences(data)
-        result = (
-            seq(sequences)
-            .map(np.array)
-            .map(self._predict_next)
-            .sum()
-        )
 
+def extrapolate(sequences: np.ndarray, steps: int = 1) -> np.ndarray:
+    """The values ``steps`` after and before every row of equal-length sequences, as two columns, in one product.
+
+    Falls back to exact Python ints whenever the largest possible column
+    total could overflow ``int64``, or the sequences already hold Python ints.
+    """
+    forward, backward = extrapolation_weights(sequences.shape[1], steps)
+    # at least 1 each, so the weights themselves must also fit even when every value is 0
+    largest = max(int(np.abs(sequences).max(initial=0)), 1)
+    bound = max(sum(map(abs, forward)), sum(map(abs, backward))) * largest * max(len(sequences), 1)
+    dtype = np.int64 if bound <= INT64_MAX and sequences.dtype != object else object
+    weights = np.array([forward, backward], dtype=dtype).T.reshape(sequences.shape[1], 2)
+    return sequences.astype(dtype) @ weights
+
+
+def _count_tokens(text: str, num_lines: int) -> tuple[np.ndarray, int]:
+    """Number of tokens on each line of ``text`` and the length of the longest, in one pass over its bytes."""
+    chars = np.frombuffer(f" {text} ".encode(), dtype=np.uint8)
+    is_token = (chars != ord(" ")) & (chars != ord("\n"))
+    edges = np.flatnonzero(is_token[1:] != is_token[:-1]) + 1
+    starts, ends = edges[0::2], edges[1::2]
+    lines = np.searchsorted(np.flatnonzero(chars == ord("\n")), starts)
+    return np.bincount(lines, minlength=num_lines), int((ends - starts).max(initial=0))
+
+
+@dataclass
+class Sequences:
+    """Sequences grouped by length, so lines of any length are extrapolated a group at a time.
+
+    ``values[length]`` holds the sequences of that length as rows, and
+    ``rows[length]`` their positions in the input.
+    """
+    values: dict[int, np.ndarray]
+    rows: dict[int, np.ndarray]
+
+    @staticmethod
+    def from_lines(lines: list[str]) -> "Sequences":
+        text = "\n".join(lines)
+        lengths, longest = _count_tokens(text, len(lines))
+        if longest > INT64_SAFE_DIGITS:
+            flat = np.array([int(token) for token in text.split()], dtype=object)
+        elif longest:
+            flat = np.fromstring(text, dtype=np.int64, sep=" ")
+        else:
+            flat = np.zeros(0, dtype=np.int64)
+        offsets = np.cumsum(lengths) - lengths
+        values, rows = {}, {}
+        for length in np.unique(lengths).tolist():
+            rows[length] = np.flatnonzero(lengths == length)
+            values[length] = flat[offsets[rows[length], None] + np.arange(length)]
+        return Sequences(values, rows)
+
+    def __len__(self) -> int:
+        return sum(map(len, self.rows.values()))
+
+    def extrapolate(self, steps: int = 1) -> np.ndarray:
+        """The values ``steps`` after and before every sequence, as two columns in input order."""
+        groups = {length: extrapolate(values, steps) for length, values in self.values.items()}
+        dtype = object if any(group.dtype == object for group in groups.values()) else np.int64
+        result = np.zeros((len(self), 2), dtype=dtype)
+        for length, group in groups.items():
+            result[self.rows[length]] = group
         return result
 
-    def _read_sequences(self, data):
-        sequences = []
-        for line in data.splitlines(keepends=False):
-            line = line.strip()
-            if len(line) > 0:
-                sequences.append(
-                    seq(line.split())
-                    .map(int)
-                    .to_list()
-                )
-        return sequences
+    def totals(self, steps: int = 1) -> tuple[int, int]:
+        """Sums of the values ``steps`` after and before every sequence, exact whatever their size."""
+        after, before = 0, 0
+        for values in self.values.values():
+            group = extrapolate(values, steps)
+            after += int(group[:, 0].sum())
+            before += int(group[:, 1].sum())
+        return after, before
+
+
+class TransformerImpl(Transformer):
+
+    def __init__(self):
+        self._steps = 1
+
+    def with_steps(self, steps: int) -> "TransformerImpl":
+        """Predict the value ``steps`` ahead (part 1) or behind (part 2) instead of the adjacent one."""
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        self._steps = steps
+        return self
+
+    def _predict(self, sequence: list[int], direction: int) -> int:
+        weights = extrapolation_weights(len(sequence), self._steps)[direction]
+        return sum(weight * value for weight, value in zip(weights, sequence))
+
+    def _read_sequence(self, line: str) -> list[int]:
+        return list(map(int, line.split()))
+
+    def parse(self, data: str) -> Sequences:
+        return Sequences.from_lines(list(iter_lines(data)))
+
+    def transform_1(self, data: str) -> Any:
+        sequences = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return sequences.totals(self._steps)[0]
 
     def transform_2(self, data: str) -> Any:
-        sequences = self._read_sequences(data)
-        result = (
-            seq(sequences)
-            .map(np.array)
-            .map(self._predict_next_backwards)
-            .sum()
-        )
-        return result
+        sequences = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return sequences.totals(self._steps)[1]
+
+    def stream_1(self, lines: str | Iterable[str]) -> int:
+        return sum(self._predict(self._read_sequence(line), 0) for line in iter_lines(lines))
+
+    def stream_2(self, lines: str | Iterable[str]) -> int:
+        return sum(self._predict(self._read_sequence(line), 1) for line in iter_lines(lines))
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    answer_2 = sut.transform_2(data)
-    print(answer_2)
+    from runner import main_for
+    main_for(__file__)
@@ -1,379 +1,153 @@
-import re
-
-import numpy as np
 from collections import deque
 from dataclasses import dataclass
-from enum import Enum, auto
-from pathlib import Path
 from typing import Any
 
-from functional import seq
+import numpy as np
 
 from transformer import Transformer
 
+AREA_MODES = ("parity", "shoelace")
+NORTH, EAST, SOUTH, WEST = 1, 2, 4, 8
+OPPOSITE = {NORTH: SOUTH, EAST: WEST, SOUTH: NORTH, WEST: EAST}
 
-@dataclass
-class Pipe:
-    north: bool = False
-    south: bool = False
-    east: bool = False
-    west: bool = False
-
-    start: bool = False
-    min_distance: int | None = None
-    visited: bool = False
-    enclosed: bool = False
-    row: int = -1
-    column: int = -1
-
-
-class Direction(Enum):
-    north = auto()
-    south = auto()
-    east = auto()
-    west = auto()
+# the directions each character connects, indexed by its byte
+PIPE_BITS = np.zeros(256, dtype=np.uint8)
+for character, bits in (
+    ("|", NORTH | SOUTH),
+    ("-", EAST | WEST),
+    ("L", NORTH | EAST),
+    ("J", NORTH | WEST),
+    ("7", SOUTH | WEST),
+    ("F", SOUTH | EAST),
+):
+    PIPE_BITS[ord(character)] = bits
 
 
 @dataclass
-class Option:
-    position: tuple[int, int]
-    pipe: Pipe
-    length: int
-
-
-class PipeFactory:
-
-    def create(self, pipe_character: str) -> Pipe:
-        match pipe_character:
-            case "|":
-                return Pipe(north=True, south=True)
-            case "-":
-                return Pipe(east=True, west=True)
-            case "L":
-                return Pipe(north=True, east=True)
-            case "J":
-                return Pipe(north=True, west=True)
-            case "7":
-                return Pipe(south=True, west=True)
-            case "F":
-                return Pipe(south=True, east=True)
-            case ".":
-                return Pipe()
-            case "S":
-                return Pipe(start=True)
+class PipeGrid:
+    """The pipes as a ``uint8`` array of N/E/S/W bits.
+
+    A bit is only kept where the neighbour it points at connects back, so
+    the start's bits are its real connections and no link leaves the grid.
+    """
+    links: np.ndarray
+    start: tuple[int, int]
+
+    @staticmethod
+    def from_text(data: str) -> "PipeGrid":
+        lines = [line for line in map(str.strip, data.splitlines(keepends=False)) if line]
+        width = max(map(len, lines))
+        chars = np.frombuffer("".join(line.ljust(width, ".") for line in lines).encode(), dtype=np.uint8)
+        chars = chars.reshape(len(lines), width)
+        start = np.argwhere(chars == ord("S"))[0]
+        pipes = PIPE_BITS[chars]
+        pipes[tuple(start)] = NORTH | EAST | SOUTH | WEST
+        links = np.zeros_like(pipes)
+        links[1:] |= pipes[1:] & (pipes[:-1] >> 2) & NORTH
+        links[:-1] |= pipes[:-1] & (pipes[1:] << 2) & SOUTH
+        links[:, :-1] |= pipes[:, :-1] & (pipes[:, 1:] >> 2) & EAST
+        links[:, 1:] |= pipes[:, 1:] & (pipes[:, :-1] << 2) & WEST
+        return PipeGrid(links, (int(start[0]), int(start[1])))
+
+    def steps(self) -> dict[int, int]:
+        """How far a move in each direction goes in the flattened grid."""
+        width = self.links.shape[1]
+        return {NORTH: -width, EAST: 1, SOUTH: width, WEST: -1}
 
 
 class TransformerImpl(Transformer):
 
-    def _fix_start(self, grid: list[list[Pipe]]) -> None:
-        start: tuple[int, int] | None = None
-        starting_pipe : Pipe|None = None
-        for row in range(len(grid)):
-            if start:
-                break
-            for col in range(len(grid[row])):
-                pipe = grid[row][col]
-                if pipe.start:
-                    start = (row, col)
-                    starting_pipe = pipe
-                    break
-        for row, col in (
-            (start[0]  -1, start[1]),
-            (start[0] + 1, start[1]),
-            (start[0], start[1] - 1),
-            (start[0], start[1] + 1)
-        ):
-            if 0 <= row <= len(grid) and 0 <= col <= len(grid[0]):
-                pipe = grid[row][col]
-                if row < start[0] and pipe.south:
-                    starting_pipe.north = True
-                elif row > start[0] and pipe.north:
-                    starting_pipe.south = True
-                elif col < start[1] and pipe.east:
-                    starting_pipe.west = True
-                elif col > start[1] and pipe.west:
-                    starting_pipe.east = True
-        return start
-
-    def transform_1(self, data: str) -> Any:
-        grid: list[list[Pipe]] = []
-        pipe_factory = PipeFactory()
-        for line in data.splitlines(keepends=False):
-            line = line.strip()
-            if len(line) > 0:
-                grid.append(
-                    seq(list(line))
-                    .map(pipe_factory.create)
-                    .to_list()
-                )
-        start: tuple[int, int] = self._fix_start(grid)
-
-        result = self._bfs(grid, start)
-
-        return result
-
-    def _get_options(self, grid: list[list[Pipe]], option: Option) -> list[Option]:
-        options = []
-        if option.pipe.north:
-            row = option.position[0] - 1
-            if row >= 0:
-                next_position = (row, option.position[1])
-                next_pipe = grid[next_position[0]][next_position[1]]
-                if not next_pipe.visited:
-                    options.append(
-                        Option(
-                            position=next_position,
-                            pipe=next_pipe,
-                            length=option.length + 1
-                        )
-                    )
-        if option.pipe.east:
-            column = option.position[1] + 1
-            if column < len(grid[0]):
-                next_position = (option.position[0], column)
-                next_pipe = grid[next_position[0]][next_position[1]]
-                if not next_pipe.visited:
-                    options.append(
-                        Option(
-                            position=next_position,
-                            pipe=next_pipe,
-                            length=option.length + 1
-                        )
-                    )
-        if option.pipe.south:
-            row = option.position[0] + 1
-            if row < len(grid):
-                next_position = (row, option.position[1])
-                next_pipe = grid[next_position[0]][next_position[1]]
-                if not next_pipe.visited:
-                    options.append(
-                        Option(
-                            position=next_position,
-                            pipe=next_pipe,
-                            length=option.length + 1
-                        )
-                    )
-        if option.pipe.west:
-            column = option.position[1] - 1
-            if column >= 0:
-                next_position = (option.position[0], column)
-                next_pipe = grid[next_position[0]][next_position[1]]
-                if not next_pipe.visited:
-                    options.append(
-                        Option(
-                            position=next_position,
-                            pipe=next_pipe,
-                            length=option.length + 1
-                        )
-                    )
-        return options
+    def __init__(self):
+        self._area_mode = "parity"
 
+    def with_area_mode(self, area_mode: str) -> "TransformerImpl":
+        """Pick ``parity``, a scan of every row, or ``shoelace``, the loop's area and Pick's theorem in O(loop length)."""
+        if area_mode not in AREA_MODES:
+            raise ValueError(f"unknown area mode {area_mode!r}, expected one of {AREA_MODES}")
+        self._area_mode = area_mode
+        return self
 
-    def _bfs(self, grid: list[list[Pipe]], current_position: tuple[int, int]):
-        q = deque()
+    def parse(self, data: str) -> PipeGrid:
+        return PipeGrid.from_text(data)
 
-        current_pipe = grid[current_position[0]][current_position[1]]
-        q.append(
-            Option(
-                position=current_position,
-                pipe=current_pipe,
-                length=0
-            ))
-        max_distance = 0
-        while len(q) > 0:
-            option = q.popleft()
-            if not option.pipe.visited:
-                option.pipe.visited = True
-                new_min_distance = min(option.length, option.pipe.min_distance or option.length)
-                option.pipe.min_distance = new_min_distance
-                max_distance = max(max_distance, option.pipe.min_distance)
-                new_options = self._get_options(grid, option)
-                q.extend(new_options)
-                pass
-        # self._print_grid(grid)
-        return max_distance
-
-    def _print_grid(self, grid: list[list[Pipe]]):
-        for row in grid:
-            print("".join(str(column.min_distance if column.min_distance is not None else ".") for column in row))
-        print("")
-
-    def _print_enclosed_grid(self, grid: list[list[Pipe]]):
-        for row in grid:
-            print("".join(str(column.min_distance if column.min_distance is not None else ("I" if column.enclosed else "O")) for column in row))
-        print("")
-
-    def _print_pipe(self, pipe: Pipe) -> str:
-        if not pipe.visited:
-            return "."
-        if pipe.north and pipe.south:
-            return "|"
-        elif pipe.east and pipe.west:
-            return "-"
-        elif pipe.north and pipe.east:
-            return "L"
-        elif pipe.north and pipe.west:
-            return "J"
-        elif pipe.south and pipe.west:
-            return "7"
-        elif pipe.south and pipe.east:
-            return "F"
-        else:
-            return "."
-
-    def _reprint_line(self, grid_line: list[Pipe]) -> str:
-        return "".join(self._print_pipe(p) for p in grid_line)
-
-    def _reprint(self, grid: list[list[Pipe]]) -> str:
-        return "\n".join(self._reprint_line(line) for line in grid)
+    def transform_1(self, data: str) -> Any:
+        grid = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return int(self._bfs(grid).max())
+
+    def _bfs(self, grid: PipeGrid) -> np.ndarray:
+        """Steps from the start to every pipe reachable from it, -1 elsewhere."""
+        links = grid.links.ravel().tolist()
+        steps = grid.steps()
+        start = grid.start[0] * grid.links.shape[1] + grid.start[1]
+        # plain lists while walking, since indexing them is much cheaper than NumPy scalars
+        distance = [-1] * len(links)
+        visited = [False] * len(links)
+        visited[start] = True
+        distance[start] = 0
+        q = deque([(start, 0)])
+        while q:
+            position, length = q.popleft()
+            for direction, step in steps.items():
+                if links[position] & direction and not visited[next_position := position + step]:
+                    visited[next_position] = True
+                    distance[next_position] = length + 1
+                    q.append((next_position, length + 1))
+        return np.array(distance, dtype=np.int64).reshape(grid.links.shape)
 
     def transform_2(self, data: str) -> Any:
-        grid: list[list[Pipe]] = []
-        pipe_factory = PipeFactory()
-        for line in data.splitlines(keepends=False):
-            line = line.strip()
-            if len(line) > 0:
-                grid.append(
-                    seq(list(line))
-                    .map(pipe_factory.create)
-                    .to_list()
-                )
-        start  = self._fix_start(grid)
-        self._get_vertices(grid, start)
-
-        data = self._reprint(grid)
-        enclosed_area = 0
-        for i, line in enumerate(data.splitlines(keepends=False)):
-            line = line.strip()
-            if len(line) > 0:
-                enclosed = False
-                nested_part = ""
-                for j, char in enumerate(line):
-                    # if not enclosed and char in ("|", "J", "7"):
-                    #     enclosed = True
-                    # elif enclosed and char in ("|", "L", "J", "7", "F"):
-                    #     enclosed = not enclosed
-                    # elif char == "S":
-                    #     if (
-                    #             ((nj := j - 1) >= 0 and line[nj] in ("-", "L", "F"))
-                    #         and ((nj := j + 1) < len(line) and line[nj] in ("-", "J", "7"))
-                    #     ) :
-                    #         pass
-                    #     else:
-                    #         enclosed = not enclosed
-                    pass
-                    match char:
-                        case "|":
-                            enclosed = not enclosed
-                        case char if char in ("L", "F"):
-                            enclosed = not enclosed
-                            nested_part = char
-                        case "7":
-                            match nested_part:
-                                case "F":
-                                    enclosed = not enclosed
-                                case "L":
-                                    enclosed = enclosed
-                        case "J":
-                            match nested_part:
-                                case "F":
-                                    enclosed = enclosed
-                                case "L":
-                                    enclosed = not enclosed
-                        case ".":
-                            if enclosed:
-                                enclosed_area += 1
-
-
-        # start: tuple[int, int] = self._fix_start(grid)
-        # max_distance = self._bfs(grid, start)
-        # for pipe in seq(grid).flatten():
-        #     pipe.visited = False
-        # vertices = self._get_vertices(grid, start)
-        # enclosed_area = self._shoelace(vertices)
-        # num_pipes = (seq(grid).flatten().filter(lambda pipe: pipe.visited).len())
-        # result = enclosed_area - (max_distance - 1)
-
-        return enclosed_area
-
-    def _shoelace(self, vertices: list[tuple[int, int]]) -> int:
-        area = 0
-        for pair in zip(vertices, vertices[1:] + vertices[:1]):
-            first = pair[0]
-            second = list(pair[1])
-            # if second[0] < first[0]:
-            #     second[0] += 1
-            # else:
-            #     second[0] -= 1
-            # if second[1] < first[1]:
-            #     second[1] += 1
-            # else:
-            #     second[1] -= 1
-            section = int(np.linalg.det([pair[0], second]))
-            # section = (second[0] - first[0]) * (second[1] - first[1])
-            area += section
-        # result = abs(area)
-        result = abs(area) // 2
-        return result
-
-    def _get_vertices(self, grid: list[list[Pipe]], start: tuple[int, int]):
-        current_vertex = start
-        vertices: list[tuple[int, int]] = []
-        direction = None
-
-        # change direction
-        vertices.append(current_vertex)
-        current_pipe: Pipe = grid[current_vertex[0]][current_vertex[1]]
-        options = self._get_options(grid, Option(current_vertex, current_pipe, 0))
-        next_option = options[0]
-        if next_option.position[0] < current_vertex[0]:
-            direction = Direction.north
-        elif next_option.position[0] > current_vertex[0]:
-            direction = Direction.south
-        elif next_option.position[1] < current_vertex[1]:
-            direction = Direction.west
-        elif next_option.position[1] > current_vertex[1]:
-            direction = Direction.east
-        current_vertex = next_option.position
-
-        while True:
-            current_pipe: Pipe = grid[current_vertex[0]][current_vertex[1]]
-            current_pipe.visited = True
-            # keep going
-            if direction in (None, Direction.north) and current_pipe.north:
-                current_vertex = (current_vertex[0] - 1, current_vertex[1])
-            elif direction in (None, Direction.east) and current_pipe.east:
-                current_vertex = (current_vertex[0], current_vertex[1] + 1)
-            elif direction in (None, Direction.south) and current_pipe.south:
-                current_vertex = (current_vertex[0] + 1, current_vertex[1])
-            elif direction in (None, Direction.west) and current_pipe.west:
-                current_vertex = (current_vertex[0], current_vertex[1] - 1)
-            else:
-                # change direction
-                options = self._get_options(grid, Option(current_vertex, current_pipe, 0))
-                if len(options) == 0:
-                    break
-                next_option = options[0]
-                if next_option.position[0] < current_vertex[0]:
-                    direction = Direction.north
-                elif next_option.position[0] > current_vertex[0]:
-                    direction = Direction.south
-                elif next_option.position[1] < current_vertex[1]:
-                    direction = Direction.west
-                elif next_option.position[1] > current_vertex[1]:
-                    direction = Direction.east
-                # if current_vertex[0] != vertices[-1][0] and current_vertex[1] != vertices[-1][1]:
-                vertices.append(current_vertex)
-                current_vertex = next_option.position
-
-        return vertices
+        grid = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            if self._area_mode == "shoelace":
+                loop = self._trace_loop(grid)
+                # Pick's theorem: area = interior + boundary / 2 - 1, with every loop cell on the boundary
+                return self._shoelace(loop) - len(loop) // 2 + 1
+            vertices, on_loop = self._get_vertices(grid)
+            # scanning each row, a cell is inside once it has crossed an odd number of pipes
+            # that lead north; the ones that don't only run along the loop's edge
+            leads_north = on_loop & (grid.links & NORTH > 0)
+            # the start can also link to a stray pipe, so its shape is the one the loop takes through it
+            row, column = grid.start
+            leads_north[row, column] = vertices[1][0] < row or vertices[-1][0] < row
+            crossings = np.cumsum(leads_north, axis=1)
+            return int((~on_loop & (crossings % 2 == 1)).sum())
+
+    def _trace_loop(self, grid: PipeGrid) -> np.ndarray:
+        """The ``(row, column)`` of every cell of the loop, in order from the start.
+
+        A stray pipe beside the start can link to it too, so each of the
+        start's links is followed in turn until one leads back round.
+        """
+        links = grid.links.ravel().tolist()
+        steps = grid.steps()
+        start = grid.start[0] * grid.links.shape[1] + grid.start[1]
+        for first in (d for d in steps if links[start] & d):
+            loop = [start]
+            direction, position = first, start + steps[first]
+            # a pipe whose only link is the one just followed is a dead end
+            while position != start and (direction := links[position] & ~OPPOSITE[direction]):
+                loop.append(position)
+                position += steps[direction]
+            if position == start:
+                return np.stack(np.divmod(np.array(loop, dtype=np.int64), grid.links.shape[1]), axis=1)
+        raise ValueError(f"no loop runs through the start at {grid.start}")
+
+    def _get_vertices(self, grid: PipeGrid) -> tuple[list[tuple[int, int]], np.ndarray]:
+        """The corners of the loop in order from the start, and which cells the loop runs through."""
+        loop = self._trace_loop(grid)
+        # a corner is where the step into a cell differs from the step out of it
+        turns = np.any(loop - np.roll(loop, 1, axis=0) != np.roll(loop, -1, axis=0) - loop, axis=1)
+        turns[0] = True
+        on_loop = np.zeros(grid.links.shape, dtype=bool)
+        on_loop[loop[:, 0], loop[:, 1]] = True
+        return list(map(tuple, loop[turns].tolist())), on_loop
+
+    def _shoelace(self, vertices: np.ndarray) -> int:
+        """Area of the polygon through ``vertices``, in order."""
+        rows, columns = vertices[:, 0], vertices[:, 1]
+        return abs(int((rows * np.roll(columns, -1) - np.roll(rows, -1) * columns).sum())) // 2
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    answer_2 = sut.transform_2(data)
-    print(answer_2)
+    from runner import main_for
+    main_for(__file__)
@@ -1,15 +1,8 @@
+import bisect
 import itertools
-import re
-
-import numpy as np
-from collections import deque
 from dataclasses import dataclass
-from enum import Enum, auto
-from pathlib import Path
 from typing import Any
 
-from functional import seq
-
 from transformer import Transformer
 
 
@@ -26,27 +19,15 @@ class TransformerImpl(Transformer):
         self._expansion_factor = 2
 
     def _expand_columns(self, galaxies: list[Galaxy]) -> None:
-        max_x = (
-            seq(galaxies)
-            .map(lambda galaxy: galaxy.x)
-            .max()
-        )
-        empty_columns = []
-        for x in range(max_x * 2):
-            num_galaxies = (
-                seq(galaxies)
-                .count(lambda galaxy: galaxy.x == x)
-            )
-            if num_galaxies == 0:
-                empty_columns.append(x)
+        max_x = max(galaxy.x for galaxy in galaxies)
+        occupied_columns = {galaxy.x for galaxy in galaxies}
+        empty_columns = [x for x in range(max_x * 2) if x not in occupied_columns]
         for galaxy in galaxies:
-            galaxy.x += (
-                seq(empty_columns)
-                .count(lambda x: x < galaxy.x)
-            ) * (self._expansion_factor - 1)
+            # empty_columns is sorted, so the number of them left of the galaxy is its insertion point
+            galaxy.x += bisect.bisect_left(empty_columns, galaxy.x) * (self._expansion_factor - 1)
 
     def transform_2(self, data: str) -> Any:
-        ...
+        return TransformerImpl().with_expansion_factor(1_000_000).transform_1(data)
 
     def transform_1(self, data: str) -> Any:
         y = 0
@@ -69,12 +50,7 @@ class TransformerImpl(Transformer):
                 y += 1
         self._expand_columns(galaxies)
 
-        result = (
-            seq(itertools.combinations(galaxies, 2))
-            .map(self._compute_distance)
-            .sum()
-        )
-        return result
+        return sum(map(self._compute_distance, itertools.combinations(galaxies, 2)))
 
     def with_expansion_factor(self, expansion_factor: int) -> "TransformerImpl":
         self._expansion_factor = expansion_factor
@@ -87,10 +63,5 @@ class TransformerImpl(Transformer):
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    answer_2 = sut.with_expansion_factor(1_000_000).transform_1(data)
-    print(answer_2)
+    from runner import main_for
+    main_for(__file__)
@@ -1,58 +1,50 @@
-import itertools
-from enum import Enum, auto
-from functools import partial, lru_cache
-from pathlib import Path
-from typing import Any, Generator
-
-from functional import seq
+from functools import lru_cache
+from typing import Any, Generator, Iterable
 
+import parallel
 from transformer import Transformer
 
 
 class TransformerImpl(Transformer):
 
+    def __init__(self):
+        self._workers = 1
+
+    def with_workers(self, workers: int) -> "TransformerImpl":
+        self._workers = workers
+        return self
+
     def transform_2(self, data: str) -> Any:
-        patterns: list[list[int]] = []
-        lines = []
-        for condition in data.splitlines(keepends=False):
-            condition = condition.strip()
-            if len(condition) > 0:
-                parts = condition.split()
-                patterns.append(
-                    seq(parts[1].split(","))
-                    .map(int)
-                    .to_list()
-                    * 5
-                )
-                lines.append("?".join([parts[0]] * 5))
-        total = 0
-        for i, (pattern, line) in enumerate(zip(patterns, lines)):
-            line_result = self._solve("." + line + ".", tuple(pattern))
-            # line_result = 1 + line_result - len(pattern)
-            total += line_result
-            print(f"Line {i + 1}/{len(lines)}: {line} -> {line_result}")
-        return total
+        return self.stream_2(data)
 
     def transform_1(self, data: str) -> Any:
-        patterns: list[list[int]] = []
-        lines: list[str] = []
-        for condition in data.splitlines(keepends=False):
-            condition = condition.strip()
-            if len(condition) > 0:
-                parts = condition.split()
-                patterns.append(
-                    seq(parts[1].split(","))
-                    .map(int)
-                    .to_list()
-                )
-                lines.append(parts[0])
-        total = 0
-        for i, (pattern, line) in enumerate(zip(patterns, lines)):
-            line_result = self._solve("." + line + ".", tuple(pattern))
-            # line_result = 1 + line_result - len(pattern)
-            total += line_result
-            print(f"Line {i + 1}/{len(lines)}: {line} -> {line_result}")
-        return total
+        return self.stream_1(data)
+
+    def stream_1(self, lines: str | Iterable[str]) -> int:
+        return parallel.sum_lines(self, "_compute_line_1", lines, self._workers)
+
+    def stream_2(self, lines: str | Iterable[str]) -> int:
+        return parallel.sum_lines(self, "_compute_line_2", lines, self._workers)
+
+    def _compute_line_1(self, condition: str) -> int:
+        return self._compute_line(condition, 1)
+
+    def _compute_line_2(self, condition: str) -> int:
+        return self._compute_line(condition, 5)
+
+    def _compute_line(self, condition: str, num_copies: int) -> int:
+        parts = condition.split()
+        pattern = list(map(int, parts[1].split(","))) * num_copies
+        line = "?".join([parts[0]] * num_copies)
+        result = self._solve("." + line + ".", tuple(pattern))
+        cache_info = self._solve.cache_info()
+        self.instrumentation.count("solve_cache_hits", cache_info.hits)
+        self.instrumentation.count("solve_cache_misses", cache_info.misses)
+        # memoised sub-problems rarely carry over between records, so drop them to keep memory flat
+        self._solve.cache_clear()
+        self._get_matches.cache_clear()
+        self._safe_index.cache_clear()
+        return result
 
     @lru_cache(maxsize=None)
     def get_search_strings(self, n: int) -> set[str]:
@@ -119,12 +111,11 @@ class TransformerImpl(Transformer):
     @lru_cache(maxsize=None)
     def _get_matches(self, max_contiguous, text):
         search_strings = self.get_search_strings(max_contiguous)
-        matches = (
-            seq(search_strings)
-            .map(partial(self._safe_index, text))
-            .flatten()
-            .to_set()
-        )
+        matches = {
+            index
+            for search_string in search_strings
+            for index in self._safe_index(text, search_string)
+        }
         return list(matches)
 
     @lru_cache(maxsize=None)
@@ -142,9 +133,5 @@ class TransformerImpl(Transformer):
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    print(sut.transform_2(data))
+    from runner import main_for
+    main_for(__file__)
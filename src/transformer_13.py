@@ -1,20 +1,14 @@
-from copy import copy
+from typing import Any
 
 import numpy as np
-import itertools
-from enum import Enum, auto
-from functools import partial, lru_cache
-from pathlib import Path
-from typing import Any, Generator
-
-from functional import seq
 
+from grid import load_grid
 from transformer import Transformer
 
 
 class TransformerImpl(Transformer):
 
-    def transform_2(self, data: str) -> Any:
+    def parse(self, data: str) -> list[np.ndarray]:
         patterns: list[list[str]] = []
         current_pattern = []
         for line in data.splitlines(keepends=False):
@@ -26,40 +20,24 @@ class TransformerImpl(Transformer):
                 current_pattern = []
         if len(current_pattern) > 0:
             patterns.append(current_pattern)
+        return [load_grid("\n".join(pattern)) == ord("#") for pattern in patterns]
 
-        result = (
-            seq(patterns)
-            .map(self._solve_2)
-            .sum()
-        )
-        return result
+    def transform_2(self, data: str) -> Any:
+        patterns = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            result = sum(map(self._solve_2, patterns))
+            return result
 
     def transform_1(self, data: str) -> Any:
-        patterns: list[list[str]] = []
-        current_pattern = []
-        for line in data.splitlines(keepends=False):
-            line = line.strip()
-            if len(line) > 0:
-                current_pattern.append(line)
-            else:
-                patterns.append(current_pattern)
-                current_pattern = []
-        if len(current_pattern) > 0:
-            patterns.append(current_pattern)
-
-        result = (
-            seq(patterns)
-            .map(self._solve_1)
-            .sum()
-        )
-        return result
+        patterns = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            result = sum(map(self._solve_1, patterns))
+            return result
 
-    def _solve_1(self, pattern: list[str]) -> int:
-        arr = np.vstack([seq(pattern).map(list).to_list()])
-        arr = (arr == '#').astype(int)
+    def _solve_1(self, arr: np.ndarray) -> int:
         result = 0
         # column wise
-        for i in range(1, len(pattern[0])):
+        for i in range(1, arr.shape[1]):
             rindex = min(arr.shape[1], 2 * i)
             right_diff = rindex - i
             left_diff = i
@@ -86,12 +64,10 @@ class TransformerImpl(Transformer):
                 result += (i * 100)
         return result
 
-    def _solve_2(self, pattern: list[str]) -> int:
-        arr = np.vstack([seq(pattern).map(list).to_list()])
-        arr = (arr == '#').astype(int)
+    def _solve_2(self, arr: np.ndarray) -> int:
         result = 0
         # column wise
-        for i in range(1, len(pattern[0])):
+        for i in range(1, arr.shape[1]):
             rindex = min(arr.shape[1], 2 * i)
             right_diff = rindex - i
             left_diff = i
@@ -120,9 +96,5 @@ class TransformerImpl(Transformer):
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    print(sut.transform_2(data))
+    from runner import main_for
+    main_for(__file__)
@@ -1,25 +1,23 @@
-from copy import copy
+from typing import Any
 
 import numpy as np
-import itertools
-from enum import Enum, auto
-from functools import partial, lru_cache
-from pathlib import Path
-from typing import Any, Generator
-
-from functional import seq
 
+from grid import load_grid, encode
 from transformer import Transformer
 
 
 class TransformerImpl(Transformer):
 
-    def transform_2(self, data: str) -> Any:
-        arr: np.ndarray = np.vstack([seq(data.splitlines(keepends=False)).map(list).to_list()])
-        arr = ((arr == 'O').astype(int) * 1) + ((arr == '#').astype(int) * 2)
+    def parse(self, data: str) -> np.ndarray:
+        # 0 empty, 1 round rock, 2 cube rock
+        return encode(load_grid(data), ".O#")
 
-        result = self._cycle(arr)
-        return result
+    def transform_2(self, data: str) -> Any:
+        # tilting works in place, so take a copy of the shared parsed grid
+        arr = self.parsed(data).copy()
+        with self.instrumentation.phase("solve"):
+            result = self._cycle(arr)
+            return result
 
     def _cycle(self, arr: np.ndarray) -> int:
         num_iterations = 1_000_000_000
@@ -63,16 +61,16 @@ class TransformerImpl(Transformer):
         arr[:] = arr[::-1, :].T
 
     def transform_1(self, data: str) -> Any:
-        arr: np.ndarray = np.vstack([seq(data.splitlines(keepends=False)).map(list).to_list()])
-        arr = ((arr == 'O').astype(int) * 1) + ((arr == '#').astype(int) * 2)
-
-        self._tilt_north(arr)
-        result = sum(
-            (i + 1) * (row == 1).sum()
-            for i, row in enumerate(arr[::-1, :])
-        )
+        # tilting works in place, so take a copy of the shared parsed grid
+        arr = self.parsed(data).copy()
+        with self.instrumentation.phase("solve"):
+            self._tilt_north(arr)
+            result = sum(
+                (i + 1) * (row == 1).sum()
+                for i, row in enumerate(arr[::-1, :])
+            )
 
-        return result
+            return result
 
     def _tilt_north(self, arr: np.ndarray) -> None:
         for col in range(arr.shape[1]):
@@ -98,9 +96,5 @@ class TransformerImpl(Transformer):
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    print(sut.transform_2(data))
+    from runner import main_for
+    main_for(__file__)
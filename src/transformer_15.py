@@ -1,18 +1,14 @@
-import re
-from collections import OrderedDict
-from dataclasses import dataclass, field
-from pathlib import Path
 from typing import Any
 
-from functional import seq
-
 from transformer import Transformer
 
 
-@dataclass
 class Box:
-    number: int
-    lenses: dict[str, int] = field(default_factory=OrderedDict)
+
+    def __init__(self, number: int):
+        self.number = number
+        # dicts keep insertion order, and replacing a lens keeps its slot
+        self.lenses: dict[str, int] = {}
 
 
 class TransformerImpl(Transformer):
@@ -20,24 +16,20 @@ class TransformerImpl(Transformer):
     def transform_2(self, data: str) -> Any:
         boxes = [Box(i) for i in range(256)]
         for sequence in data.strip().split(","):
-            groups = re.match(r"(\w+)([=-])(\d*)", sequence).groups()
-            label  = groups[0]
+            label, operation, focal_length = sequence.partition("=")
+            if not operation:
+                label, operation = sequence[:-1], sequence[-1]
             box_index = self._hash(label)
             box = boxes[box_index]
-            match groups[1]:
-                case  "=":
-                    box.lenses[label] = int(groups[2])
+            match operation:
+                case "=":
+                    box.lenses[label] = int(focal_length)
                 case "-":
                     try:
                         del box.lenses[label]
                     except KeyError:
                         pass
-        result = (
-            seq(boxes)
-            .map(self._get_focusing_power)
-            .sum()
-        )
-        return result
+        return sum(map(self._get_focusing_power, boxes))
 
     def _get_focusing_power(self, box: Box) -> int:
         result = 0
@@ -47,12 +39,7 @@ class TransformerImpl(Transformer):
         return result
 
     def transform_1(self, data: str) -> Any:
-        result = (
-            seq(data.strip().split(","))
-            .map(self._hash)
-            .sum()
-        )
-        return result
+        return sum(map(self._hash, data.strip().split(",")))
 
     def _hash(self, data: str) -> int:
         value = 0
@@ -64,9 +51,5 @@ class TransformerImpl(Transformer):
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    print(sut.transform_2(data))
+    from runner import main_for
+    main_for(__file__)
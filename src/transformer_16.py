@@ -1,10 +1,9 @@
 from collections import deque
-from pathlib import Path
 from typing import Any, Generator
 
 import numpy as np
-from functional import seq
 
+from grid import load_grid
 from transformer import Transformer
 
 LEFT = (0, -1)
@@ -13,52 +12,48 @@ UP = (-1, 0)
 DOWN = (1, 0)
 
 
+class Tile:
+    EMPTY = ord(".")
+    VERTICAL_SPLITTER = ord("|")
+    HORIZONTAL_SPLITTER = ord("-")
+    BACK_MIRROR = ord("\\")
+    FORWARD_MIRROR = ord("/")
+
+
 class TransformerImpl(Transformer):
 
     def __init__(self):
         self._data: np.ndarray | None = None
 
+    def parse(self, data: str) -> np.ndarray:
+        return load_grid(data)
+
     def transform_2(self, data: str) -> Any:
-        lines = []
-        for line in data.splitlines(False):
-            line = line.strip()
-            if len(line) > 0:
-                lines.append(line)
-        self._data = np.array([list(line) for line in lines])
-
-        beams = (
-            # top down
-                [((-1, column), (1, 0)) for column in range(self._data.shape[1])]
-                # bottom up
-                + [((self._data.shape[0] - 1, column), (-1, 0)) for column in range(self._data.shape[1])]
-                # left right
-                + [((row, -1), (0, 1)) for row in range(self._data.shape[0])]
-                # right left
-                + [((row, self._data.shape[1] - 1), (0, -1)) for row in range(self._data.shape[0])]
-        )
-
-        result = (
-            seq(beams)
-            .map(self._energise)
-            .map(np.sum)
-            .max()
-        )
-
-        return result
+        self._data = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            beams = (
+                # top down
+                    [((-1, column), (1, 0)) for column in range(self._data.shape[1])]
+                    # bottom up
+                    + [((self._data.shape[0] - 1, column), (-1, 0)) for column in range(self._data.shape[1])]
+                    # left right
+                    + [((row, -1), (0, 1)) for row in range(self._data.shape[0])]
+                    # right left
+                    + [((row, self._data.shape[1] - 1), (0, -1)) for row in range(self._data.shape[0])]
+            )
+
+            result = max(np.sum(self._energise(beam)) for beam in beams)
+
+            return result
 
     def transform_1(self, data: str) -> Any:
-        lines = []
-        for line in data.splitlines(False):
-            line = line.strip()
-            if len(line) > 0:
-                lines.append(line)
-        self._data = np.array([list(line) for line in lines])
-
-        beam = (0, -1), (0, 1)
-        energised = self._energise(beam)
-        result = np.sum(energised)
+        self._data = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            beam = (0, -1), (0, 1)
+            energised = self._energise(beam)
+            result = np.sum(energised)
 
-        return result
+            return result
 
     def _energise(self, beam: tuple[tuple[int, int], tuple[int, int]]) -> np.ndarray:
         energised = np.zeros_like(self._data, dtype=bool)
@@ -75,6 +70,7 @@ class TransformerImpl(Transformer):
             beam_queue.extend(new_beams)
             pass
 
+        self.instrumentation.count("beams_processed", len(seen))
         return energised
 
     def _move(self, beam, energised) -> Generator[tuple[tuple[int, int], tuple[int, int]], None, None]:
@@ -89,17 +85,17 @@ class TransformerImpl(Transformer):
         energised[*position] = True
         # adjust trajectory
         match self._data[*position]:
-            case ".":
+            case Tile.EMPTY:
                 pass
-            case "|":
+            case Tile.VERTICAL_SPLITTER:
                 if trajectory[1] != 0:
                     trajectory = DOWN
                     yield position, UP
-            case "-":
+            case Tile.HORIZONTAL_SPLITTER:
                 if trajectory[0] != 0:
                     trajectory = RIGHT
                     yield position, LEFT
-            case "\\":
+            case Tile.BACK_MIRROR:
                 match trajectory:
                     case 0, 1:
                         trajectory = DOWN
@@ -109,7 +105,7 @@ class TransformerImpl(Transformer):
                         trajectory = RIGHT
                     case -1, 0:
                         trajectory = LEFT
-            case "/":
+            case Tile.FORWARD_MIRROR:
                 match trajectory:
                     case 0, 1:
                         trajectory = UP
@@ -123,11 +119,5 @@ class TransformerImpl(Transformer):
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    answer_2 = sut.transform_2(data)
-    assert 7901 < answer_2
-    print(answer_2)
+    from runner import main_for
+    main_for(__file__)
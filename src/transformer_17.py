@@ -1,11 +1,11 @@
 import heapq
 from collections import defaultdict
 from functools import lru_cache
-from pathlib import Path
 from typing import Any
 
 import numpy as np
 
+from grid import load_grid
 from transformer import Transformer
 
 LEFT = (0, -1)
@@ -19,17 +19,15 @@ class TransformerImpl(Transformer):
     def __init__(self):
         self._arr: np.ndarray | None = None
 
-    def transform_1(self, data: str) -> Any:
-        lines = []
-        for line in data.splitlines(False):
-            line = line.strip()
-            if len(line) > 0:
-                lines.append(line)
+    def parse(self, data: str) -> np.ndarray:
+        return (load_grid(data) - ord("0")).astype(int)
 
-        self._arr = np.array([list(line) for line in lines]).astype(int)
-        result = self._solve(1, 3)
+    def transform_1(self, data: str) -> Any:
+        self._arr = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            result = self._solve(1, 3)
 
-        return result
+            return result
 
     def _solve(self, min_steps: int, max_steps: int) -> int:
         queue = []
@@ -42,9 +40,14 @@ class TransformerImpl(Transformer):
 
         dist = defaultdict(lambda *_: 9223372036854775807)  # idea from Dijkstra's algo
 
+        num_pops = 0
         while len(queue) > 0:
             loss, location, last_trajectory = heapq.heappop(queue)
+            num_pops += 1
             if location == destination:
+                # everything pushed was either popped or is still queued
+                self.instrumentation.count("heap_pops", num_pops)
+                self.instrumentation.count("heap_pushes", num_pops + len(queue))
                 return loss
             trajectories = self._get_trajectories(last_trajectory)
 
@@ -79,21 +82,11 @@ class TransformerImpl(Transformer):
         return trajectories
 
     def transform_2(self, data: str) -> Any:
-        lines = []
-        for line in data.splitlines(False):
-            line = line.strip()
-            if len(line) > 0:
-                lines.append(line)
-        self._arr = np.array([list(line) for line in lines]).astype(int)
-
-        return self._solve(4, 10)
+        self._arr = self.parsed(data)
+        with self.instrumentation.phase("solve"):
+            return self._solve(4, 10)
 
 
 if __name__ == "__main__":
-    file_path = Path(__file__)
-    data_path = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt")
-    data = data_path.read_text()
-    sut = TransformerImpl()
-    print(sut.transform_1(data))
-    answer_2 = sut.transform_2(data)
-    print(answer_2)
+    from runner import main_for
+    main_for(__file__)
@@ -0,0 +1,64 @@
+import os
+from unittest import TestCase, skipUnless
+
+import benchmark
+
+
+class TestBenchmark(TestCase):
+
+    def test_repeat_lines(self):
+        self.assertEqual("a\nb\na\nb", benchmark.repeat_lines("a\nb\n", 2))
+
+    def test_repeat_blocks(self):
+        self.assertEqual("a\nb\n\nc\n\na\nb\n\nc", benchmark.repeat_blocks("a\nb\n\nc\n", 2))
+
+    def test_repeat_items(self):
+        self.assertEqual("rn=1,cm-,rn=1,cm-", benchmark.repeat_items("rn=1,cm-\n", 2))
+
+    def test_repeat_seeds(self):
+        self.assertEqual(
+            "seeds: 79 14 79 14\n\nseed-to-soil map:\n50 98 2",
+            benchmark.repeat_seeds("seeds: 79 14\n\nseed-to-soil map:\n50 98 2", 2)
+        )
+
+    def test_parse_import_time(self):
+        report = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   grid\n"
+            "import time:       251 |       4371 | transformer_02\n"
+        )
+        self.assertEqual(0.004371, benchmark.parse_import_time(report))
+
+    def test_measure_imports(self):
+        timings = benchmark.measure_imports([15], 1)
+        self.assertEqual(["15.import"], list(timings))
+        self.assertGreater(timings["15.import"], 0)
+
+    def test_measure_almanac(self):
+        timings = benchmark.measure_almanac(3, 1)
+        self.assertEqual(["05.almanac.reparse", "05.almanac.compiled"], list(timings))
+
+    def test_load_data_unscalable(self):
+        self.assertIsNone(benchmark.load_data(10, 10))
+
+    def test_find_regressions(self):
+        baseline = {"02.1.x1": 1.0, "02.2.x1": 1.0, "03.1.x1": 0.0001}
+        timings = {"02.1.x1": 1.1, "02.2.x1": 1.5, "03.1.x1": 0.0005, "04.1.x1": 9.0}
+        self.assertEqual({"02.2.x1": (1.0, 1.5)}, benchmark.find_regressions(timings, baseline, 20))
+
+
+@skipUnless(os.environ.get("AOC_BENCHMARK"), "set AOC_BENCHMARK=1 to run the benchmark regression suite")
+class TestBenchmarkRegressions(TestCase):
+    """Compares every day against the saved baseline; record one with ``python src/benchmark.py --save``."""
+
+    def test_no_regressions(self):
+        if not benchmark.BASELINE_PATH.exists():
+            self.skipTest(f"no baseline at {benchmark.BASELINE_PATH}; record one with python src/benchmark.py --save")
+        baseline = benchmark.load_baseline()
+        scales = [int(scale) for scale in os.environ.get("AOC_BENCHMARK_SCALES", "1").split(",")]
+        days = list(benchmark.runner.discover())
+        timings = benchmark.measure(days, list(benchmark.runner.PARTS), scales, repeat=5)
+        # a benchmark without a baseline would otherwise pass unchecked
+        self.assertEqual([], sorted(set(timings) - set(baseline)), "missing from the baseline, record them with --save")
+        regressions = benchmark.find_regressions(timings, baseline)
+        self.assertEqual({}, regressions, benchmark.format_comparison(timings, baseline))
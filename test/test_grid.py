@@ -0,0 +1,61 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import numpy
+
+from grid import digit_runs, encode, load_grid, load_grid_file
+
+
+class TestGrid(TestCase):
+
+    def test_load_grid(self):
+        grid = load_grid("#.O\n..#\n")
+        self.assertEqual(numpy.uint8, grid.dtype)
+        numpy.testing.assert_array_equal([[35, 46, 79], [46, 46, 35]], grid)
+
+    def test_load_grid_untidy(self):
+        numpy.testing.assert_array_equal(load_grid("#.O\n..#"), load_grid("\n  #.O \r\n\n..#\r\n\n"))
+
+    def test_load_grid_ragged(self):
+        with self.assertRaises(ValueError):
+            load_grid("#.O\n..")
+
+    def test_load_grid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for content in (b"#.O\n..#\n", b"#.O\n..#", b"#.O\r\n..#\r\n"):
+                path = Path(directory).joinpath("grid.txt")
+                path.write_bytes(content)
+                numpy.testing.assert_array_equal(load_grid("#.O\n..#"), load_grid_file(path))
+                numpy.testing.assert_array_equal(load_grid("#.O\n..#"), load_grid_file(path, mmap=False))
+
+    def test_load_grid_file_ragged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath("grid.txt")
+            for content in (b"#.O\n..\n#.O\n", b"#.O\n..#\n#.", b"#.O\n..#.\n"):
+                path.write_bytes(content)
+                for mmap in (True, False):
+                    with self.assertRaises(ValueError):
+                        load_grid_file(path, mmap=mmap)
+            # only a copy can mix line endings
+            path.write_bytes(b"#.O\r\n..#\n#.O\r\n")
+            with self.assertRaises(ValueError):
+                load_grid_file(path)
+
+    def test_load_grid_file_empty(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath("grid.txt")
+            path.write_bytes(b"")
+            self.assertEqual(0, load_grid_file(path).size)
+
+    def test_digit_runs(self):
+        starts, ends, values = digit_runs(numpy.frombuffer(b"12 blue, 7: 305", dtype=numpy.uint8))
+        self.assertEqual([0, 9, 12], starts.tolist())
+        self.assertEqual([2, 10, 15], ends.tolist())
+        self.assertEqual([12, 7, 305], values.tolist())
+        self.assertEqual([], digit_runs(numpy.zeros(0, dtype=numpy.uint8))[2].tolist())
+
+    def test_encode(self):
+        codes = encode(load_grid("#.O\n..x"), ".O#")
+        self.assertEqual(numpy.int8, codes.dtype)
+        numpy.testing.assert_array_equal([[2, 0, 1], [0, 0, -1]], codes)
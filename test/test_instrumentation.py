@@ -0,0 +1,64 @@
+import json
+from unittest import TestCase
+
+from instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from transformer_16 import TransformerImpl as TransformerImpl16
+from transformer_17 import TransformerImpl as TransformerImpl17
+
+
+class TestInstrumentation(TestCase):
+
+    def test_phase(self):
+        sut = Instrumentation()
+        with sut.phase("outer"):
+            with sut.phase("inner"):
+                pass
+            with sut.phase("inner"):
+                pass
+        self.assertEqual({("outer",), ("outer", "inner")}, set(sut.phases))
+        self.assertGreaterEqual(sut.phases[("outer",)], sut.phases[("outer", "inner")])
+
+    def test_count_and_merge(self):
+        sut = Instrumentation()
+        sut.count("pushes")
+        sut.count("pushes", 2)
+        other = Instrumentation()
+        other.count("pushes", 4)
+        other.phases[("a",)] = 1.5
+        sut.merge(other)
+        self.assertEqual({"pushes": 7}, sut.counters)
+        self.assertEqual({"phases": {"a": 1.5}, "counters": {"pushes": 7}}, json.loads(sut.to_json()))
+
+    def test_to_collapsed(self):
+        sut = Instrumentation()
+        sut.phases[("day_17",)] = 3.0
+        sut.phases[("day_17", "parse")] = 0.5
+        sut.phases[("day_17", "solve")] = 2.0
+        self.assertEqual("day_17 500000\nday_17;parse 500000\nday_17;solve 2000000", sut.to_collapsed())
+
+    def test_null_instrumentation(self):
+        with NULL_INSTRUMENTATION.phase("anything"):
+            NULL_INSTRUMENTATION.count("anything")
+
+    def test_transformer_counters(self):
+        instrumentation = Instrumentation()
+        data = """111111111111
+999999999991
+999999999991
+999999999991
+999999999991"""
+        self.assertEqual(71, TransformerImpl17().with_instrumentation(instrumentation).transform_2(data))
+        self.assertGreater(instrumentation.counters["heap_pushes"], instrumentation.counters["heap_pops"])
+        self.assertEqual({("parse",), ("solve",)}, set(instrumentation.phases))
+
+        TransformerImpl16().with_instrumentation(instrumentation).transform_1(r""".|...\....
+|.-.\.....
+.....|-...
+........|.
+..........
+.........\
+..../.\\..
+.-.-/..|..
+.|....-|.\
+..//.|....""")
+        self.assertGreater(instrumentation.counters["beams_processed"], 46)
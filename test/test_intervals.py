@@ -0,0 +1,64 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from intervals import MIN, IntervalMap, compose, merge_intervals
+
+
+def random_map(rng: random.Random, size: int = 100) -> IntervalMap:
+    sources = sorted(rng.sample(range(size), 2 * rng.randrange(1, 6)))
+    return IntervalMap.from_ranges(
+        (start, rng.randrange(size), end - start) for start, end in zip(sources[0::2], sources[1::2])
+    )
+
+
+class TestIntervals(TestCase):
+
+    def setUp(self):
+        # the seed-to-soil map of the day 5 example
+        self.seed_to_soil = IntervalMap.from_ranges([(98, 50, 2), (50, 52, 48)])
+
+    def test_merge_intervals(self):
+        self.assertEqual([(0, 5), (7, 9)], merge_intervals([(3, 5), (7, 9), (0, 3), (1, 2), (4, 4)]))
+        self.assertEqual([], merge_intervals([]))
+
+    def test_from_ranges(self):
+        self.assertEqual([MIN, 50, 98, 100], self.seed_to_soil.starts)
+        self.assertEqual([0, 2, -48, 0], self.seed_to_soil.offsets)
+        # touching ranges that shift by the same amount become one segment
+        self.assertEqual(IntervalMap([MIN, 10, 30], [0, 5, 0]), IntervalMap.from_ranges([(20, 25, 10), (10, 15, 10)]))
+
+    def test_from_ranges_overlapping(self):
+        with self.assertRaises(ValueError):
+            IntervalMap.from_ranges([(0, 10, 5), (3, 20, 5)])
+
+    def test_call(self):
+        self.assertEqual([0, 49, 52, 99, 50, 51, 100], [self.seed_to_soil(x) for x in (0, 49, 50, 97, 98, 99, 100)])
+
+    def test_map_intervals(self):
+        self.assertEqual([(40, 52), (57, 105)], self.seed_to_soil.map_intervals([(40, 50), (55, 105)]))
+
+    def test_compose(self):
+        rng = random.Random(5)
+        for _ in range(50):
+            maps = [random_map(rng) for _ in range(4)]
+            composed = compose(maps)
+            for x in range(-5, 130):
+                expected = x
+                for m in maps:
+                    expected = m(expected)
+                self.assertEqual(expected, composed(x))
+
+    def test_lookup(self):
+        values = np.array([0, 49, 50, 97, 98, 99, 100], dtype=np.int64)
+        self.assertEqual([0, 49, 52, 99, 50, 51, 100], self.seed_to_soil.lookup(values).tolist())
+
+    def test_range_min(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            composed = compose(random_map(rng) for _ in range(3))
+            starts = np.array([rng.randrange(-10, 120) for _ in range(40)], dtype=np.int64)
+            ends = starts + np.array([rng.randrange(1, 60) for _ in range(40)], dtype=np.int64)
+            expected = [min(composed(x) for x in range(start, end)) for start, end in zip(starts.tolist(), ends.tolist())]
+            self.assertEqual(expected, composed.range_min(starts, ends).tolist())
@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+import parallel
+from instrumentation import Instrumentation
+from transformer_02 import TransformerImpl as TransformerImpl02
+from transformer_04 import TransformerImpl as TransformerImpl04
+from transformer_12 import TransformerImpl as TransformerImpl12
+
+
+class TestParallel(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.games = """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
+Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
+Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
+Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
+        cls.cards = """Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53
+Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19
+Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1
+Card 4: 41 92 73 84 69 | 59 84 76 51 58  5 54 83
+Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36
+Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11"""
+        cls.records = """???.### 1,1,3
+.??..??...?##. 1,1,3
+?#?#?#?#?#?#?#? 1,3,1,6
+????.#...#... 4,1,1
+????.######..#####. 1,6,5
+?###???????? 3,2,1"""
+
+    def test_map_lines_keeps_order(self):
+        sut = TransformerImpl12()
+        expected = [1, 4, 1, 1, 4, 10]
+        self.assertEqual(expected, list(parallel.map_lines(sut, "_compute_line_1", self.records)))
+        self.assertEqual(expected, list(parallel.map_lines(sut, "_compute_line_1", self.records, workers=2, chunk_size=1)))
+
+    def test_map_chunks(self):
+        sut = TransformerImpl02()
+        expected = [60, 2190, 36]
+        self.assertEqual(expected, list(parallel.map_chunks(sut, "_compute_chunk_2", self.games, chunk_size=2)))
+        self.assertEqual(expected, list(parallel.map_chunks(sut, "_compute_chunk_2", self.games, workers=2, chunk_size=2)))
+
+    def test_sum_lines(self):
+        sut = TransformerImpl12()
+        self.assertEqual(525152, parallel.sum_lines(sut, "_compute_line_2", self.records, workers=2, chunk_size=2))
+
+    def test_with_workers(self):
+        self.assertEqual(30, TransformerImpl04().with_workers(2).stream_2(self.cards))
+        self.assertEqual(21, TransformerImpl12().with_workers(3).transform_1(self.records))
+
+    def test_worker_counters(self):
+        counters = []
+        for workers in (1, 2):
+            instrumentation = Instrumentation()
+            TransformerImpl12().with_workers(workers).with_instrumentation(instrumentation).transform_2(self.records)
+            counters.append(dict(instrumentation.counters))
+        self.assertGreater(counters[0]["solve_cache_hits"], 0)
+        self.assertEqual(counters[0], counters[1])
@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+import runner
+from transformer_02 import TransformerImpl
+
+
+class TestRunner(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
+Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
+Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
+Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
+
+    def test_discover(self):
+        days = runner.discover()
+        self.assertIn(2, days)
+        self.assertIn(17, days)
+        self.assertEqual(sorted(days), list(days))
+
+    def test_run_part(self):
+        answer, wall_time, cpu_time, peak_rss = runner.run_part(TransformerImpl, self.data, 2, repeat=3)
+        self.assertEqual(2286, answer)
+        self.assertGreaterEqual(wall_time, 0)
+        self.assertGreaterEqual(cpu_time, 0)
+        self.assertGreater(peak_rss, 0)
+
+    def test_run(self):
+        results = runner.run([2], [1, 2])
+        self.assertEqual([(2, 1), (2, 2)], [(result.day, result.part) for result in results])
+        self.assertIn("total", runner.format_report(results))
+
+    def test_schedule(self):
+        timings = {"2.1": 0.1, "2.2": 3.0, "3.1": 1.0}
+        self.assertEqual(
+            [(3, 2), (2, 2), (3, 1), (2, 1)],
+            runner.schedule([(2, 1), (2, 2), (3, 1), (3, 2)], timings)
+        )
+
+    def test_run_parallel(self):
+        results = runner.run_parallel([2], [1, 2], jobs=2, timings={"2.1": 1.0, "2.2": 0.1})
+        self.assertEqual([(2, 1), (2, 2)], [(result.day, result.part) for result in results])
+        self.assertEqual([2285, 77021], [result.answer for result in results])
@@ -0,0 +1,99 @@
+import importlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import numpy
+
+from transformer import ParseCache, iter_lines
+
+
+class Parser:
+
+    def __init__(self):
+        self.calls = 0
+
+    def parse(self, data: str):
+        self.calls += 1
+        return data.split()
+
+    def parse_array(self, data: str):
+        self.calls += 1
+        return numpy.array(data.split(), dtype=int)
+
+
+class TestParseCache(TestCase):
+
+    def test_get(self):
+        cache = ParseCache()
+        parser = Parser()
+        self.assertEqual(["1", "2"], cache.get(Parser, "1 2", parser.parse))
+        self.assertEqual(["1", "2"], cache.get(Parser, "1 2", parser.parse))
+        self.assertEqual(["3"], cache.get(Parser, "3", parser.parse))
+        self.assertEqual(2, parser.calls)
+
+    def test_evict(self):
+        cache = ParseCache(max_entries=2)
+        parser = Parser()
+        for data in ("1", "2", "1", "3", "1", "2"):
+            cache.get(Parser, data, parser.parse)
+        # "2" was the least recently used when "3" came in
+        self.assertEqual(4, parser.calls)
+        cache.get(Parser, "4", parser.parse_array)
+        self.assertEqual(2, len(cache._entries[f"{Parser.__module__}.Parser"]))
+
+    def test_clear(self):
+        cache = ParseCache()
+        parser = Parser()
+        cache.get(Parser, "1 2", parser.parse)
+        cache.clear()
+        cache.get(Parser, "1 2", parser.parse)
+        self.assertEqual(2, parser.calls)
+
+    def test_persist(self):
+        with tempfile.TemporaryDirectory() as directory:
+            parser = Parser()
+            ParseCache(directory).get(Parser, "1 2", parser.parse)
+            ParseCache(directory).get(Parser, "1 2 3", parser.parse_array)
+            self.assertEqual(1, len(list(Path(directory).glob("*.pkl"))))
+            self.assertEqual(1, len(list(Path(directory).glob("*.npy"))))
+
+            self.assertEqual(["1", "2"], ParseCache(directory).get(Parser, "1 2", parser.parse))
+            numpy.testing.assert_array_equal([1, 2, 3], ParseCache(directory).get(Parser, "1 2 3", parser.parse_array))
+            self.assertEqual(2, parser.calls)
+
+    def test_stale_entry(self):
+        with tempfile.TemporaryDirectory() as directory:
+            parser = Parser()
+            ParseCache(directory).get(Parser, "1 2", parser.parse)
+            # a pickle of a class that no longer exists, as left by an older version of a day
+            for path in Path(directory).glob("*.pkl"):
+                path.write_bytes(b"cmissing_module\nMissing\n.")
+            self.assertEqual(["1", "2"], ParseCache(directory).get(Parser, "1 2", parser.parse))
+            self.assertEqual(["1", "2"], ParseCache(directory).get(Parser, "1 2", parser.parse))
+            self.assertEqual(2, parser.calls)
+
+    def test_version(self):
+        with tempfile.TemporaryDirectory() as directory:
+            module_path = Path(directory).joinpath("versioned_parser.py")
+            module_path.write_text("def parse(data):\n    return data.split()\n")
+            sys.path.insert(0, directory)
+            try:
+                module = importlib.import_module("versioned_parser")
+                before = ParseCache()._version(module.__name__)
+                self.assertEqual(before, ParseCache()._version(module.__name__))
+                module_path.write_text("def parse(data):\n    return data.split(';')\n")
+                self.assertNotEqual(before, ParseCache()._version(module.__name__))
+            finally:
+                sys.path.remove(directory)
+                sys.modules.pop("versioned_parser", None)
+        self.assertEqual("unversioned", ParseCache()._version("not_a_module"))
+
+
+class TestIterLines(TestCase):
+
+    def test_iter_lines(self):
+        self.assertEqual(["a b", "c"], list(iter_lines(" a b\n\nc\n")))
+        self.assertEqual(["a b", "c"], list(iter_lines(io.StringIO(" a b\n\nc\n"))))
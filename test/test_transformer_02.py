@@ -1,3 +1,4 @@
+import io
 from unittest import TestCase
 
 from transformer_02 import TransformerImpl
@@ -21,3 +22,42 @@ Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
 Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
         sut = TransformerImpl()
         self.assertEqual(2286, sut.transform_2(data))
+
+    def test_stream(self):
+        data = """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
+Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
+Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
+Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
+        sut = TransformerImpl()
+        self.assertEqual(8, sut.stream_1(io.StringIO(data)))
+        self.assertEqual(2286, sut.stream_2(line for line in data.splitlines()))
+
+    def test_with_limits(self):
+        data = """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
+Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
+Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
+Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
+        self.assertEqual(15, TransformerImpl().with_limits(20, 20, 20).transform_1(data))
+        self.assertEqual(1, TransformerImpl().with_limits(4, 2, 6).with_workers(2).stream_1(data))
+
+    def test_index(self):
+        data = """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
+Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
+Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
+Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
+        index = TransformerImpl().index(data)
+        limits = [(12, 13, 14), (0, 0, 0), (100, 100, 100), (4, 2, 6), (6, 3, 6)]
+        self.assertEqual([8, 0, 15, 1, 8], index.possible_id_sums(limits).tolist())
+        self.assertEqual([3, 0, 5, 1, 3], index.possible_counts(limits).tolist())
+
+    def test_parse(self):
+        data = """Game 7: 3 blue, 4 red; 1 red, 2 green, 6 blue
+Game 12: 20 red"""
+        table = TransformerImpl().parse(data)
+        self.assertEqual([7, 12], table.ids.tolist())
+        self.assertEqual([4, 20], table.red.tolist())
+        self.assertEqual([2, 0], table.green.tolist())
+        self.assertEqual([6, 0], table.blue.tolist())
@@ -4,7 +4,8 @@ from unittest import TestCase
 
 import numpy
 
-from transformer_03 import TransformerImpl
+from grid import load_grid
+from transformer_03 import ENGINES, TransformerImpl, tokenize
 
 numpy.set_printoptions(threshold=sys.maxsize)
 
@@ -48,3 +49,52 @@ class TestTransformer03(TestCase):
 .664.598.."""
         sut = TransformerImpl()
         self.assertEqual(467835, sut.transform_2(data))
+
+    def test_tokenize(self):
+        numbers = tokenize(load_grid("467..114..\n...*......\n..35...633"))
+        self.assertEqual([467, 114, 35, 633], numbers.values.tolist())
+        self.assertEqual([0, 0, 2, 2], numbers.rows.tolist())
+        self.assertEqual([0, 5, 2, 7], numbers.col_starts.tolist())
+        self.assertEqual([3, 8, 4, 10], numbers.col_ends.tolist())
+        self.assertEqual([], tokenize(load_grid("..\n.*")).values.tolist())
+
+    def test_parse(self):
+        data = """12.*
+..34
+5..."""
+        schematic = TransformerImpl().parse(data)
+        self.assertEqual([0, 12, 34, 5], schematic.values.tolist())
+        self.assertEqual([[1, 1, 0, 0], [0, 0, 2, 2], [3, 0, 0, 0]], schematic.labels.tolist())
+
+    def test_transform_edges(self):
+        data = """*12
+3..
+...
+45*"""
+        for engine in ENGINES:
+            sut = TransformerImpl().with_engine(engine)
+            self.assertEqual(60, sut.transform_1(data))
+            self.assertEqual(36, sut.transform_2(data))
+
+    def test_sparse_engine(self):
+        data = """467..114..
+...*......
+..35..633.
+......#...
+617*......
+.....+.58.
+..592.....
+......755.
+...$.*....
+.664.598.."""
+        sut = TransformerImpl().with_engine("sparse")
+        self.assertEqual(4361, sut.transform_1(data))
+        self.assertEqual(467835, sut.transform_2(data))
+        file_path = Path(__file__)
+        real = file_path.parents[1].joinpath("data", f"data_{file_path.name[-5:-3]}.txt").read_text()
+        self.assertEqual(TransformerImpl().transform_1(real), sut.transform_1(real))
+        self.assertEqual(TransformerImpl().transform_2(real), sut.transform_2(real))
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            TransformerImpl().with_engine("quantum")
@@ -1,8 +1,10 @@
+import io
 import sys
 from unittest import TestCase
 
 import numpy
 
+import transformer_04
 from transformer_04 import TransformerImpl
 
 numpy.set_printoptions(threshold=sys.maxsize)
@@ -29,3 +31,36 @@ Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36
 Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11"""
         sut = TransformerImpl()
         self.assertEqual(30, sut.transform_2(data))
+
+    def test_stream(self):
+        data = """Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53
+Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19
+Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1
+Card 4: 41 92 73 84 69 | 59 84 76 51 58  5 54 83
+Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36
+Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11"""
+        sut = TransformerImpl()
+        self.assertEqual(13, sut.stream_1(io.StringIO(data)))
+        self.assertEqual(30, sut.stream_2(io.StringIO(data)))
+
+    def test_count_matches(self):
+        lines = [
+            "Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53",
+            "Card 2:  1 64 65 127 | 127 65 2 0",
+            "Card 3: 200 | 200",
+        ]
+        self.assertEqual([4, 2, 1], TransformerImpl()._count_matches(lines).tolist())
+
+    def test_popcount_fallback(self):
+        words = numpy.array([[0, 1], [2 ** 64 - 1, 5]], dtype=numpy.uint64)
+        self.assertEqual([1, 66], transformer_04.BYTE_POPCOUNT[words.view(numpy.uint8)].sum(axis=1).tolist())
+        self.assertEqual([1, 66], transformer_04._popcount_rows(words).tolist())
+
+    def test_count_cards_exact(self):
+        num_match_list = [3, 1, 2, 0] + [2] * 120 + [1, 0]
+        copies = [1] * len(num_match_list)
+        for i, num_matches in enumerate(num_match_list):
+            for j in range(i + 1, i + 1 + num_matches):
+                copies[j] += copies[i]
+        self.assertGreater(max(copies), 2 ** 63)
+        self.assertEqual(sum(copies), TransformerImpl()._count_cards(iter(num_match_list)))
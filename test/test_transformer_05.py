@@ -1,9 +1,10 @@
 import sys
+import pickle
 from unittest import TestCase, skip
 
 import numpy
 
-from transformer_05 import TransformerImpl
+from transformer_05 import Almanac, TransformerImpl
 
 numpy.set_printoptions(threshold=sys.maxsize)
 
@@ -52,3 +53,27 @@ humidity-to-location map:
 
     def test_transform_2(self):
         self.assertEqual(46, self.sut.transform_2(self.data))
+
+    def test_almanac(self):
+        almanac = Almanac.from_text(self.data)
+        self.assertEqual(["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"],
+                         almanac.categories)
+        self.assertEqual(2, almanac.stage_by_source["fertilizer"])
+        seeds = numpy.array([79, 14, 55, 13], dtype=numpy.int64)
+        self.assertEqual([82, 43, 86, 35], almanac.locations(seeds).tolist())
+        # the example's walk for seed 79: soil 81, fertilizer 81, water 81, light 74, temperature 78, humidity 78
+        self.assertEqual([81], almanac.convert(numpy.array([79]), "seed", "soil").tolist())
+        self.assertEqual([74], almanac.convert(numpy.array([81]), "fertilizer", "light").tolist())
+        self.assertEqual([82], almanac.convert(numpy.array([78]), "humidity", "location").tolist())
+        self.assertEqual([78], almanac.convert(numpy.array([78]), "humidity", "humidity").tolist())
+        for source, dest in (("water", "soil"), ("location", "seed"), ("seed", "moon")):
+            with self.assertRaises(ValueError):
+                almanac.convert(numpy.array([78]), source, dest)
+        self.assertEqual(46, almanac.lowest_location(almanac.seeds[0::2], almanac.seeds[1::2]))
+
+    def test_almanac_pickles(self):
+        almanac = Almanac.from_text(self.data)
+        almanac.locations(almanac.seeds)
+        restored = pickle.loads(pickle.dumps(almanac))
+        self.assertEqual(almanac.stages, restored.stages)
+        self.assertEqual(35, int(restored.locations(restored.seeds).min()))
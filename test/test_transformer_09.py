@@ -1,10 +1,11 @@
+import io
 import sys
 from pathlib import Path
 from unittest import TestCase, skip
 
 import numpy
 
-from transformer_09 import TransformerImpl
+from transformer_09 import Sequences, TransformerImpl, extrapolate, extrapolation_weights
 
 numpy.set_printoptions(threshold=sys.maxsize)
 
@@ -32,3 +33,66 @@ class TestTransformer09(TestCase):
 
     def test_transform_2(self):
         self.assertEqual(2, self.sut.transform_2(self.data))
+
+    def test_stream(self):
+        self.assertEqual(114, self.sut.stream_1(io.StringIO(self.data)))
+        self.assertEqual(2, self.sut.stream_2(io.StringIO(self.data)))
+
+    def test_extrapolate(self):
+        sequences = numpy.array([[0, 3, 6, 9, 12, 15], [1, 3, 6, 10, 15, 21], [10, 13, 16, 21, 30, 45]])
+        self.assertEqual([[18, -3], [28, 0], [68, 5]], extrapolate(sequences).tolist())
+
+    def test_extrapolate_overflow(self):
+        # cubes of large numbers, whose extrapolated totals no longer fit in int64
+        sequences = numpy.array([[(10 ** 6 + i + j) ** 3 for i in range(4)] for j in range(2)], dtype=numpy.int64)
+        result = extrapolate(numpy.repeat(sequences, 5000, axis=0))
+        self.assertEqual(object, result.dtype)
+        self.assertEqual(5000 * ((10 ** 6 + 4) ** 3 + (10 ** 6 + 5) ** 3), result[:, 0].sum())
+
+    def test_extrapolate_zeros(self):
+        # the weights of 70 values pass int64 even though every value, and so every result, is 0
+        result = extrapolate(numpy.zeros((2, 70), dtype=numpy.int64))
+        self.assertEqual([[0, 0], [0, 0]], result.tolist())
+        self.assertEqual(0, self.sut.transform_1(" ".join(["0"] * 70)))
+
+    def test_different_lengths(self):
+        sequences = self.sut.parse("1 2 3\n5\n0 1 4 9\n2 4")
+        self.assertEqual([1, 2, 3, 4], sorted(sequences.values))
+        self.assertEqual([[4, 0], [5, 5], [16, 1], [6, 0]], sequences.extrapolate().tolist())
+        self.assertEqual(4 + 5 + 16 + 6, self.sut.transform_1("1 2 3\n5\n0 1 4 9\n2 4"))
+
+    def test_big_numbers(self):
+        # numbers beyond int64 are read and extrapolated exactly
+        big = 10 ** 20
+        sequences = Sequences.from_lines([f"{big} {2 * big} {3 * big}", "-1 -2"])
+        self.assertEqual(9999999999999999999, Sequences.from_lines(["9999999999999999999"]).totals()[0])
+        self.assertEqual([[4 * big, 0], [-3, 0]], sequences.extrapolate().tolist())
+        self.assertEqual((4 * big - 3, 0), sequences.totals())
+
+    def test_steps(self):
+        # the squares, any number of steps either side
+        for steps in range(1, 6):
+            forward, backward = extrapolation_weights(4, steps)
+            squares = [x ** 2 for x in range(4)]
+            self.assertEqual((3 + steps) ** 2, sum(w * x for w, x in zip(forward, squares)))
+            self.assertEqual(steps ** 2, sum(w * x for w, x in zip(backward, squares)))
+        sut = TransformerImpl().with_steps(3)
+        self.assertEqual(sut.stream_1(io.StringIO(self.data)), sut.transform_1(self.data))
+        self.assertEqual(sut.stream_2(io.StringIO(self.data)), sut.transform_2(self.data))
+        self.assertEqual([[24, -9], [45, 1], [146, -19]], extrapolate(Sequences.from_lines(self.data.splitlines()).values[6], 3).tolist())
+        with self.assertRaises(ValueError):
+            TransformerImpl().with_steps(0)
+
+    def test_steps_small_values(self):
+        # far enough ahead, the weights alone pass int64 however small the values are
+        sut = TransformerImpl().with_steps(40)
+        zeros = " ".join(["0"] * 30)
+        self.assertEqual(0, sut.transform_1(zeros))
+        self.assertEqual(0, sut.transform_2(zeros))
+        line = " ".join(map(str, range(30)))
+        self.assertEqual(29 + 40, sut.transform_1(line))
+        self.assertEqual(-40, sut.transform_2(line))
+        self.assertEqual(sut.stream_1(io.StringIO(line)), sut.transform_1(line))
+        data = "1 2 3\n0 0\n1 4 9 16"
+        self.assertEqual(3 + 40 + 0 + (4 + 40) ** 2, sut.transform_1(data))
+        self.assertEqual(1 - 40 + 0 + (1 - 40) ** 2, sut.transform_2(data))
@@ -4,7 +4,7 @@ from unittest import TestCase, skip
 
 import numpy
 
-from transformer_10 import TransformerImpl
+from transformer_10 import EAST, SOUTH, TransformerImpl
 
 numpy.set_printoptions(threshold=sys.maxsize)
 
@@ -75,3 +75,64 @@ L---JF-JLJ.||-FJLJJ7
 7-L-JL7||F7|L7F-7F7|
 L.L7LFJ|||||FJL7||LJ
 L7JLJL-JLJLJL--JLJ.L"""))
+
+    def test_parse(self):
+        grid = self.sut.parse("""7-F7-
+.FJ|7
+SJLL7
+|F--J
+LJ.LJ""")
+        self.assertEqual((2, 0), grid.start)
+        # only the pipes that connect back count, so the start links south and east
+        self.assertEqual(SOUTH | EAST, grid.links[2, 0])
+        self.assertEqual(0, grid.links[0, 0])
+        self.assertEqual(EAST | SOUTH, grid.links[0, 2])
+
+    def test_get_vertices(self):
+        vertices, on_loop = self.sut._get_vertices(self.sut.parse(""".....
+.S-7.
+.|.|.
+.L-J.
+....."""))
+        self.assertEqual([(1, 1), (1, 3), (3, 3), (3, 1)], vertices)
+        self.assertEqual(8, on_loop.sum())
+        self.assertFalse(on_loop[2, 2])
+
+    def test_stray_pipe_at_start(self):
+        # the pipe north of the start links to it but leads nowhere
+        data = """.|...
+.S-7.
+.|.|.
+.L-J.
+....."""
+        self.assertEqual(4, self.sut.transform_1(data))
+        self.assertEqual(1, self.sut.transform_2(data))
+        self.assertEqual(1, TransformerImpl().with_area_mode("shoelace").transform_2(data))
+        with self.assertRaises(ValueError):
+            self.sut.transform_2(".|.\n.S-\n...")
+
+    def test_transform_2_shoelace(self):
+        sut = TransformerImpl().with_area_mode("shoelace")
+        self.assertEqual(4, sut.transform_2("""...........
+.S-------7.
+.|F-----7|.
+.||.....||.
+.||.....||.
+.|L-7.F-J|.
+.|..|.|..|.
+.L--J.L--J.
+..........."""))
+        self.assertEqual(self.sut.transform_2(self.real_data), sut.transform_2(self.real_data))
+        with self.assertRaises(ValueError):
+            TransformerImpl().with_area_mode("flood")
+
+    def test_shoelace(self):
+        loop = self.sut._trace_loop(self.sut.parse("""..F7.
+.FJ|.
+SJ.L7
+|F--J
+LJ..."""))
+        self.assertEqual(16, len(loop))
+        self.assertEqual([2, 0], loop[0].tolist())
+        # one enclosed cell, so by Pick's theorem the area is 1 + 16 / 2 - 1
+        self.assertEqual(8, self.sut._shoelace(loop))
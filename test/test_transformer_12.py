@@ -1,3 +1,4 @@
+import io
 import sys
 from pathlib import Path
 from unittest import TestCase
@@ -79,3 +80,13 @@ class TestTransformer11(TestCase):
             ]),
             self.sut.get_search_strings(2)
         )
+
+    def test_stream(self):
+        data = """???.### 1,1,3
+.??..??...?##. 1,1,3
+?#?#?#?#?#?#?#? 1,3,1,6
+????.#...#... 4,1,1
+????.######..#####. 1,6,5
+?###???????? 3,2,1"""
+        self.assertEqual(21, self.sut.stream_1(io.StringIO(data)))
+        self.assertEqual(525152, self.sut.stream_2(line for line in data.splitlines()))